@@ -0,0 +1,79 @@
+"""
+Async-aware memoization for agent analysis methods.
+"""
+
+import asyncio
+import hashlib
+import orjson
+from functools import wraps
+from typing import Any, Callable, Dict, List
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Wrapped functions register here so test fixtures can clear every
+# analysis cache in one call
+_REGISTRY: List[Callable] = []
+
+
+def async_lru_cache(maxsize: int = 256):
+    """
+    Memoize an async method by the serialized value of its arguments.
+
+    The same user query is analyzed repeatedly across a workflow (query
+    agent, impact agent, retries, tests); hits skip the LLM/heuristic work
+    entirely. Keys hash the argument values, so the cache is shared across
+    agent instances and `self` never pins an agent alive. Concurrent calls
+    with the same key share one in-flight computation, and failures are
+    never cached. Entries evict oldest-first once maxsize is exceeded.
+
+    Args:
+        maxsize: Maximum number of cached results
+
+    Returns:
+        Decorator for async methods
+    """
+    def decorator(func: Callable) -> Callable:
+        cache: Dict[bytes, asyncio.Future] = {}
+
+        @wraps(func)
+        async def wrapper(self, *args: Any, **kwargs: Any) -> Any:
+            # orjson emits bytes directly, skipping the str->bytes detour
+            key = hashlib.blake2b(
+                orjson.dumps([args, kwargs], option=orjson.OPT_SORT_KEYS, default=str),
+                digest_size=16
+            ).digest()
+
+            future = cache.get(key)
+            if future is not None:
+                # Shield so a cancelled waiter doesn't cancel the shared
+                # computation out from under other callers
+                return await asyncio.shield(future)
+
+            future = asyncio.get_running_loop().create_future()
+            cache[key] = future
+            if len(cache) > maxsize:
+                cache.pop(next(iter(cache)))
+
+            try:
+                result = await func(self, *args, **kwargs)
+            except BaseException as e:
+                cache.pop(key, None)
+                future.set_exception(e)
+                future.exception()  # mark retrieved when nobody is waiting
+                raise
+            future.set_result(result)
+            return result
+
+        wrapper.cache_clear = cache.clear
+        _REGISTRY.append(wrapper)
+        return wrapper
+
+    return decorator
+
+
+def clear_analysis_caches() -> None:
+    """Clear every registered analysis cache (used between tests)."""
+    for wrapper in _REGISTRY:
+        wrapper.cache_clear()
@@ -36,7 +36,7 @@ class BaseAgent(ABC):
             session_id: Session identifier
             request_id: Request identifier
         """
-        self.agent_id = str(uuid.uuid4())
+        self.agent_id = uuid.uuid4().hex
         self.agent_type = agent_type
         self.session_id = session_id
         self.request_id = request_id
@@ -70,6 +70,22 @@ class BaseAgent(ABC):
         """
         pass
     
+    def reset(self) -> None:
+        """
+        Clear per-execution state so the agent instance can be reused.
+
+        Identity (agent_id, session_id, request_id) and any injected
+        clients are kept; everything a run accumulates is discarded.
+        """
+        self.state = AgentState.IDLE
+        self.status = AgentStatus.PENDING
+        self.steps = []
+        self.start_time = None
+        self.end_time = None
+        self.result = None
+        self.error = None
+        self.metadata = {}
+
     def add_step(self, step_name: str, step_type: str, status: str = "in_progress", 
                  output: Optional[Dict[str, Any]] = None, error: Optional[AgentError] = None) -> str:
         """
@@ -214,22 +230,27 @@ class BaseAgent(ABC):
             logger.info("Starting agent execution", agent_id=self.agent_id, agent_type=self.agent_type)
             
             # Run with timeout
-            response = await asyncio.wait_for(
+            await asyncio.wait_for(
                 self.execute(input_data),
                 timeout=timeout_seconds
             )
-            
+
             self.end_time = datetime.utcnow()
-            self.state = AgentState.COMPLETED
-            self.status = AgentStatus.COMPLETED
-            
+            # execute() reports its own failures via set_error; a normal
+            # return must not overwrite that terminal state
+            if self.error is None:
+                self.state = AgentState.COMPLETED
+                self.status = AgentStatus.COMPLETED
+
             logger.info(
                 "Agent execution completed",
                 agent_id=self.agent_id,
                 duration_ms=self.calculate_duration()
             )
-            
-            return response
+
+            # Snapshot after the state transition; the response built
+            # inside execute() still reads PROCESSING
+            return self.to_response()
             
         except asyncio.TimeoutError:
             self.end_time = datetime.utcnow()
@@ -287,12 +308,12 @@ class BaseAgent(ABC):
     
     def is_completed(self) -> bool:
         """
-        Check if agent execution is completed.
-        
+        Check if agent execution has reached a terminal state.
+
         Returns:
             True if completed
         """
-        return self.status in [AgentStatus.COMPLETED, AgentStatus.FAILED, AgentStatus.TIMEOUT]
+        return self.state in AgentState.TERMINAL
     
     def is_successful(self) -> bool:
         """
@@ -0,0 +1,91 @@
+"""
+Disk-backed cache for expensive LLM outputs.
+"""
+
+import hashlib
+import sqlite3
+import threading
+
+import orjson
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_DEFAULT_CACHE_PATH = Path(".agent_cache") / "sql_cache.db"
+
+
+class AgentCache:
+    """
+    Small persistent key/value store for generated SQL.
+
+    Entries survive process restarts, so repeated prompts (the same
+    question asked across sessions, deployments or test runs) skip the
+    LLM round trip entirely. SQLite in WAL mode handles concurrent
+    readers alongside a single writer; all access goes through one
+    connection behind a lock since entries are tiny and writes rare.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the cache, creating the database file on first use.
+
+        Args:
+            path: Database file path (defaults to .agent_cache/sql_cache.db)
+        """
+        cache_path = Path(path) if path else _DEFAULT_CACHE_PATH
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(cache_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        Build a deterministic key from JSON-serializable parts.
+
+        Args:
+            parts: Values identifying the computation (model, prompt, ...)
+
+        Returns:
+            Hex digest usable as a cache key
+        """
+        # orjson emits bytes directly, skipping the str->bytes detour
+        payload = orjson.dumps(parts, option=orjson.OPT_SORT_KEYS, default=str)
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value for key, or None on miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: str) -> None:
+        """Store value under key, replacing any previous entry."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value) VALUES (?, ?)",
+                (key, value)
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+
+@lru_cache(maxsize=1)
+def get_agent_cache() -> AgentCache:
+    """Process-wide cache instance, created on first use."""
+    return AgentCache()
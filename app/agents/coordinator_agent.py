@@ -13,6 +13,7 @@ from app.agents.impact_analysis_agent import ImpactAnalysisAgent
 from app.models.agent import AgentType, AgentResponse
 from app.utils.logger import get_logger
 from app.core.session_manager import session_manager
+from app.config.settings import settings
 
 logger = get_logger(__name__)
 
@@ -20,9 +21,18 @@ logger = get_logger(__name__)
 class CoordinatorAgent(BaseAgent):
     """Agent responsible for orchestrating other agents and managing workflows."""
     
-    def __init__(self, session_id: str, request_id: str):
-        """Initialize coordinator agent."""
+    def __init__(self, session_id: str, request_id: str, bq_client=None):
+        """Initialize coordinator agent.
+
+        Args:
+            bq_client: Optional BigQuery client threaded through to the
+                sub-agents; None lets each use the shared process client
+        """
         super().__init__(AgentType.COORDINATOR_AGENT, session_id, request_id)
+        self.bq_client = bq_client
+        # Bounds sub-agent fan-out across concurrent workflows on this
+        # coordinator; without it a burst of executes spawns unbounded tasks
+        self._sub_agent_sema = asyncio.Semaphore(settings.max_parallel_agents)
         
     async def execute(self, input_data: Dict[str, Any]) -> AgentResponse:
         """
@@ -59,6 +69,11 @@ class CoordinatorAgent(BaseAgent):
                 return self.to_response()
             self.update_step("query_execution", "success", output={"query_agent_id": query_result.agent_id})
             
+            # Share the query agent's analysis with downstream agents so
+            # they derive intent from it instead of re-parsing the query
+            if query_result.result and query_result.result.get("analysis"):
+                context["_analysis"] = query_result.result["analysis"]
+            
             # Step 3: Execute optimization agent (if enabled)
             optimization_result = None
             if enable_optimization and query_result.result:
@@ -122,6 +137,50 @@ class CoordinatorAgent(BaseAgent):
             self.set_error("execution_error", str(e), "COORDINATOR_AGENT_ERROR")
             return self.to_response()
     
+    async def run_batch_async(self, inputs: List[Dict[str, Any]],
+                              max_concurrency: int = 8) -> List[AgentResponse]:
+        """
+        Execute many workflows concurrently with bounded fan-out.
+
+        A single gather schedules the whole batch in one event-loop pass
+        instead of callers looping await per workflow; the semaphore keeps
+        at most max_concurrency workflows in flight. Each workflow runs on
+        its own coordinator instance: execute() accumulates steps, result
+        and error on self, so concurrent runs on one instance would
+        interleave each other's state.
+
+        Args:
+            inputs: Input payloads, one per workflow
+            max_concurrency: Maximum workflows in flight at once
+
+        Returns:
+            Agent responses in the same order as inputs
+        """
+        sema = asyncio.Semaphore(max_concurrency)
+
+        async def _one(input_data: Dict[str, Any]) -> AgentResponse:
+            async with sema:
+                coordinator = CoordinatorAgent(
+                    self.session_id, self.request_id, bq_client=self.bq_client
+                )
+                return await coordinator.execute(input_data)
+
+        return await asyncio.gather(*(_one(input_data) for input_data in inputs))
+
+    async def _run_sub_agent(self, agent: BaseAgent, input_data: Dict[str, Any]) -> AgentResponse:
+        """
+        Run a sub-agent under the shared concurrency cap.
+
+        Args:
+            agent: Sub-agent instance to run
+            input_data: Input payload for the agent
+
+        Returns:
+            The sub-agent's response
+        """
+        async with self._sub_agent_sema:
+            return await agent.run_with_timeout(input_data)
+
     async def _initialize_workflow(self, user_query: str, context: Dict[str, Any], 
                                  enable_optimization: bool, enable_impact_analysis: bool) -> Dict[str, Any]:
         """
@@ -171,13 +230,13 @@ class CoordinatorAgent(BaseAgent):
             Query agent response
         """
         try:
-            query_agent = QueryAgent(self.session_id, self.request_id)
+            query_agent = QueryAgent(self.session_id, self.request_id, bq_client=self.bq_client)
             input_data = {
                 "query": user_query,
                 "context": context
             }
             
-            return await query_agent.run_with_timeout(input_data)
+            return await self._run_sub_agent(query_agent, input_data)
             
         except Exception as e:
             logger.error("Failed to execute query agent", error=str(e))
@@ -195,14 +254,14 @@ class CoordinatorAgent(BaseAgent):
             Optimization agent response or None if failed
         """
         try:
-            optimization_agent = OptimizationAgent(self.session_id, self.request_id)
+            optimization_agent = OptimizationAgent(self.session_id, self.request_id, bq_client=self.bq_client)
             input_data = {
                 "sql_query": query_result.get("sql_query", ""),
                 "original_query": query_result.get("original_query", ""),
                 "context": context
             }
             
-            return await optimization_agent.run_with_timeout(input_data)
+            return await self._run_sub_agent(optimization_agent, input_data)
             
         except Exception as e:
             logger.error("Failed to execute optimization agent", error=str(e))
@@ -234,7 +293,7 @@ class CoordinatorAgent(BaseAgent):
                 "context": enhanced_context
             }
             
-            return await impact_agent.run_with_timeout(input_data)
+            return await self._run_sub_agent(impact_agent, input_data)
             
         except Exception as e:
             logger.error("Failed to execute impact analysis agent", error=str(e))
@@ -392,8 +451,9 @@ class CoordinatorAgent(BaseAgent):
         # Add impact insights
         impact_summary = synthesized_result.get("impact_summary", {})
         if impact_summary.get("overall_impact_score", 0) > 0.5:
+            # Whole-number percentage: ".1%" rendered 0.75 as "75.0%"
             response_parts.append(
-                f"This query has a {impact_summary['overall_impact_score']:.1%} business impact score."
+                f"This query has a {int(impact_summary['overall_impact_score'] * 100)}% business impact score."
             )
         
         # Add recommendations
@@ -401,7 +461,10 @@ class CoordinatorAgent(BaseAgent):
         if recommendations:
             response_parts.append("Key recommendations:")
             for i, rec in enumerate(recommendations[:3], 1):  # Limit to top 3
-                response_parts.append(f"{i}. {rec.get('description', '')}")
+                # Optimization recommendations are dicts, impact
+                # recommendations plain strings
+                desc = rec.get("description", "") if isinstance(rec, dict) else rec
+                response_parts.append(f"{i}. {desc}")
         
         return " ".join(response_parts) if response_parts else "Analysis completed successfully."
 
@@ -2,24 +2,50 @@
 Impact analysis agent for analyzing business impact of query results.
 """
 
-from typing import Dict, Any, List, Optional
+import json
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
 from app.agents.base_agent import BaseAgent
+from app.agents._cache import async_lru_cache
 from app.models.agent import AgentType, AgentResponse
-from app.utils.azure_openai_client import AzureOpenAIClient
+from app.utils.azure_openai_client import get_azure_client
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=128)
+def _match_metric_columns(columns: Tuple[str, ...],
+                          business_metrics: Tuple[str, ...]) -> Tuple[str, ...]:
+    """
+    Columns whose names mention any of the business metrics.
+
+    Result shapes and intent metrics repeat heavily across a session, so
+    the substring matching runs once per distinct (columns, metrics) pair
+    instead of per result row.
+
+    Args:
+        columns: Column names from the result set
+        business_metrics: Metric keywords from the intent analysis
+
+    Returns:
+        Matching column names in result order
+    """
+    return tuple(
+        column for column in columns
+        if any(metric in column for metric in business_metrics)
+    )
+
+
 class ImpactAnalysisAgent(BaseAgent):
     """Agent responsible for analyzing business impact of query results."""
     
     def __init__(self, session_id: str, request_id: str):
         """Initialize impact analysis agent."""
         super().__init__(AgentType.IMPACT_ANALYSIS_AGENT, session_id, request_id)
-        self.llm_client = AzureOpenAIClient()
+        self.llm_client = get_azure_client()
         
     async def execute(self, input_data: Dict[str, Any]) -> AgentResponse:
         """
@@ -90,6 +116,7 @@ class ImpactAnalysisAgent(BaseAgent):
             self.set_error("execution_error", str(e), "IMPACT_ANALYSIS_ERROR")
             return self.to_response()
     
+    @async_lru_cache(maxsize=256)
     async def _analyze_query_intent(self, original_query: str, sql_query: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """
         Analyze the business intent behind the query using LLM with enhanced schema context.
@@ -102,6 +129,13 @@ class ImpactAnalysisAgent(BaseAgent):
         Returns:
             Intent analysis
         """
+        # The coordinator stashes the query agent's analysis in the
+        # context; reusing it halves the intent-analysis LLM calls per
+        # workflow
+        shared_analysis = (context or {}).get("_analysis")
+        if shared_analysis:
+            return self._derive_intent_from_analysis(shared_analysis)
+
         # Use LLM for business intent analysis with enhanced context
         system_prompt = """You are a business analyst with deep understanding of data structures and business intelligence. 
 Analyze the user's query to understand:
@@ -158,18 +192,65 @@ Analyze the business intent:"""
         logger.info("Business intent analysis completed", intent=intent_analysis)
         return intent_analysis
     
+    @staticmethod
+    def _derive_intent_from_analysis(analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Map the query agent's analysis onto the intent-analysis shape.
+
+        Fields the upstream analysis cannot know fall back to neutral
+        defaults, keeping the contract identical to the LLM path.
+
+        Args:
+            analysis: Query analysis produced by the query agent
+
+        Returns:
+            Intent analysis derived without another LLM round trip
+        """
+        return {
+            "business_objective": analysis.get("intent", ""),
+            "stakeholder": "analyst",
+            "decision_impact": "",
+            "business_domain": analysis.get("business_domain", "general"),
+            "urgency_level": "medium",
+            "strategic_importance": "medium",
+            "data_complexity": analysis.get("complexity", "simple"),
+            "business_metrics": analysis.get("metrics", []),
+            "time_dimension": "current",
+            "comparison_type": "absolute"
+        }
+
     async def _extract_key_metrics(self, query_result: Dict[str, Any], intent_analysis: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Extract key metrics and KPIs from query results using LLM.
-        
+        Extract key metrics and KPIs from query results.
+
+        The primary metric is derived structurally from the first row:
+        column names are matched against the intent's business metrics via
+        a cached helper, so wide result sets never pay a per-row scan and
+        the answer is deterministic. The LLM pass then enriches the result
+        with trends and implications, and is best-effort rather than fatal.
+
         Args:
             query_result: Query execution results
             intent_analysis: Business intent analysis
-            
+
         Returns:
             Key metrics analysis
         """
-        # Use LLM for metric extraction
+        data = query_result.get("data", [])
+        metrics: Dict[str, Any] = {"primary_metric": None}
+        if data:
+            metric_columns = _match_metric_columns(
+                tuple(data[0].keys()),
+                tuple(intent_analysis.get("business_metrics", []))
+            )
+            if metric_columns:
+                primary_name = metric_columns[0]
+                metrics["primary_metric"] = {
+                    "name": primary_name,
+                    "value": data[0].get(primary_name)
+                }
+
+        # Use LLM for metric enrichment
         system_prompt = """You are a data analyst. Extract key metrics and KPIs from the query results.
 Identify:
 1. Primary metrics (main numbers/values)
@@ -196,20 +277,22 @@ Business Intent: {intent_analysis}
 
 Extract key metrics:"""
 
-        response = await self.llm_client.client.chat.completions.create(
-            model=self.llm_client.deployment_name,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.2,
-            max_tokens=500
-        )
-        
-        content = response.choices[0].message.content
-        import json
-        metrics = json.loads(content)
-        
+        try:
+            response = await self.llm_client.client.chat.completions.create(
+                model=self.llm_client.deployment_name,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=0.2,
+                max_tokens=500
+            )
+
+            content = response.choices[0].message.content
+            metrics.update(json.loads(content))
+        except Exception as e:
+            logger.warning("LLM metric enrichment failed", error=str(e))
+
         logger.info("Key metrics extracted", metrics_count=len(metrics.get("primary_metrics", [])))
         return metrics
     
@@ -7,20 +7,32 @@ from typing import Dict, Any, Optional, List
 from datetime import datetime
 
 from app.agents.base_agent import BaseAgent
+from app.agents._cache import async_lru_cache
 from app.models.agent import AgentType, AgentResponse
 from app.utils.bigquery_client import BigQueryClient
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Compiled once at import: _analyze_query_structure runs per optimization
+# pass, and per-call re.search/findall pays a regex-cache lookup each time.
+_JOIN_RE = re.compile(r'JOIN\s+(\w+)')
+_LIMIT_RE = re.compile(r'LIMIT\s+(\d+)')
+
 
 class OptimizationAgent(BaseAgent):
     """Agent responsible for analyzing and optimizing SQL queries."""
     
-    def __init__(self, session_id: str, request_id: str):
-        """Initialize optimization agent."""
+    def __init__(self, session_id: str, request_id: str,
+                 bq_client: Optional[BigQueryClient] = None):
+        """Initialize optimization agent.
+
+        Args:
+            bq_client: BigQuery client to use; tests inject a fake here,
+                production falls back to the shared process client
+        """
         super().__init__(AgentType.OPTIMIZATION_AGENT, session_id, request_id)
-        self.bq_client = BigQueryClient()
+        self.bq_client = bq_client if bq_client is not None else BigQueryClient()
         
     async def execute(self, input_data: Dict[str, Any]) -> AgentResponse:
         """
@@ -94,6 +106,7 @@ class OptimizationAgent(BaseAgent):
             self.set_error("execution_error", str(e), "OPTIMIZATION_AGENT_ERROR")
             return self.to_response()
     
+    @async_lru_cache(maxsize=256)
     async def _analyze_query_structure(self, sql_query: str) -> Dict[str, Any]:
         """
         Analyze the structure of the SQL query.
@@ -121,7 +134,7 @@ class OptimizationAgent(BaseAgent):
         
         # Count complexity factors
         if "JOIN" in query_upper:
-            analysis["joins"] = re.findall(r'JOIN\s+(\w+)', query_upper)
+            analysis["joins"] = _JOIN_RE.findall(query_upper)
             analysis["complexity_score"] += len(analysis["joins"]) * 2
         
         if "GROUP BY" in query_upper:
@@ -133,7 +146,7 @@ class OptimizationAgent(BaseAgent):
             analysis["complexity_score"] += 1
         
         if "LIMIT" in query_upper:
-            limit_match = re.search(r'LIMIT\s+(\d+)', query_upper)
+            limit_match = _LIMIT_RE.search(query_upper)
             if limit_match:
                 analysis["limit"] = int(limit_match.group(1))
         
@@ -171,8 +184,10 @@ class OptimizationAgent(BaseAgent):
             Cost analysis
         """
         try:
-            # Use BigQuery dry run to get cost estimates
-            validation_result = self.bq_client.validate_query(sql_query)
+            # Use BigQuery dry run to get cost estimates; the batched path
+            # keeps the blocking call off the event loop and coalesces the
+            # original/optimized dry-run pair with other concurrent callers.
+            validation_result = await self.bq_client.validate_query_batched(sql_query)
             
             if validation_result.get("valid"):
                 bytes_processed = validation_result.get("total_bytes_processed", 0)
@@ -2,15 +2,19 @@
 Query agent for natural language to SQL conversion and execution.
 """
 
+import asyncio
 import re
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 
 from app.agents.base_agent import BaseAgent
+from app.agents._cache import async_lru_cache
+from app.agents.cache import get_agent_cache
 from app.models.agent import AgentType, AgentResponse
 from app.utils.bigquery_client import BigQueryClient
-from app.utils.azure_openai_client import AzureOpenAIClient
+from app.utils.azure_openai_client import get_azure_client, stable_context
 from app.utils.logger import get_logger
+from app.config.settings import settings
 from app.core.session_manager import session_manager
 
 logger = get_logger(__name__)
@@ -19,11 +23,17 @@ logger = get_logger(__name__)
 class QueryAgent(BaseAgent):
     """Agent responsible for converting natural language to SQL and executing queries."""
     
-    def __init__(self, session_id: str, request_id: str):
-        """Initialize query agent."""
+    def __init__(self, session_id: str, request_id: str,
+                 bq_client: Optional[BigQueryClient] = None):
+        """Initialize query agent.
+
+        Args:
+            bq_client: BigQuery client to use; tests inject a fake here,
+                production falls back to the shared process client
+        """
         super().__init__(AgentType.QUERY_AGENT, session_id, request_id)
-        self.bq_client = BigQueryClient()
-        self.llm_client = AzureOpenAIClient()
+        self.bq_client = bq_client if bq_client is not None else BigQueryClient()
+        self.llm_client = get_azure_client()
         
     async def execute(self, input_data: Dict[str, Any]) -> AgentResponse:
         """
@@ -44,9 +54,12 @@ class QueryAgent(BaseAgent):
                 self.set_error("invalid_input", "No query provided", "MISSING_QUERY")
                 return self.to_response()
             
-            # Step 1: Understand the query using LLM
+            # Step 1: Understand the query using LLM. The analysis cache
+            # keys on its arguments, so the per-request context fields
+            # (timestamp, user_id) are stripped before the call or every
+            # request would miss
             self.add_step("query_understanding", "nlp_analysis")
-            query_analysis = await self._analyze_query(user_query, context)
+            query_analysis = await self._analyze_query(user_query, stable_context(context))
             self.update_step("query_understanding", "success", output=query_analysis)
             
             # Step 2: Get schema information if needed
@@ -65,9 +78,10 @@ class QueryAgent(BaseAgent):
             sql_query = await self._generate_sql(user_query, query_analysis, schema_info, context)
             self.update_step("sql_generation", "success", output={"sql_query": sql_query})
             
-            # Step 4: Validate SQL query
+            # Step 4: Validate SQL query (dry-runs from concurrent chats are
+            # micro-batched and executed off the event loop)
             self.add_step("sql_validation", "query_validation")
-            validation_result = self.bq_client.validate_query(sql_query)
+            validation_result = await self.bq_client.validate_query_batched(sql_query)
             if not validation_result.get("valid"):
                 self.update_step("sql_validation", "error", 
                                error=self._create_error("sql_validation_error", validation_result.get("error", "Unknown validation error")))
@@ -75,9 +89,9 @@ class QueryAgent(BaseAgent):
                 return self.to_response()
             self.update_step("sql_validation", "success", output=validation_result)
             
-            # Step 5: Execute query
+            # Step 5: Execute query (blocking network I/O, keep it in a worker thread)
             self.add_step("query_execution", "bigquery_execution")
-            query_result = self.bq_client.execute_query(sql_query)
+            query_result = await asyncio.to_thread(self.bq_client.execute_query, sql_query)
             if not query_result.get("success"):
                 self.update_step("query_execution", "error",
                                error=self._create_error("query_execution_error", query_result.get("error", "Query execution failed")))
@@ -106,6 +120,7 @@ class QueryAgent(BaseAgent):
             self.set_error("execution_error", str(e), "QUERY_AGENT_ERROR")
             return self.to_response()
     
+    @async_lru_cache(maxsize=256)
     async def _analyze_query(self, query: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """
         Analyze the user query to understand intent and requirements using LLM.
@@ -138,19 +153,19 @@ class QueryAgent(BaseAgent):
         """
         try:
             # Get comprehensive schema info from INFORMATION_SCHEMA
-            schema_info = self.bq_client.get_comprehensive_schema_info(table_names)
-            
+            schema_info = await asyncio.to_thread(self.bq_client.get_comprehensive_schema_info, table_names)
+
             if "error" in schema_info:
                 logger.warning("Failed to get comprehensive schema, falling back to basic schema", error=schema_info["error"])
                 # Fallback to basic schema info
                 schema_info = {
                     "tables": {},
-                    "available_tables": self.bq_client.list_tables()
+                    "available_tables": await asyncio.to_thread(self.bq_client.list_tables)
                 }
-                
+
                 for table_name in table_names:
                     try:
-                        table_schema = self.bq_client._get_basic_schema_info(table_name)
+                        table_schema = await asyncio.to_thread(self.bq_client._get_basic_schema_info, table_name)
                         if "error" not in table_schema:
                             schema_info["tables"][table_name] = table_schema
                     except Exception as e:
@@ -158,15 +173,15 @@ class QueryAgent(BaseAgent):
             
             # Add available tables list if not present
             if "available_tables" not in schema_info:
-                schema_info["available_tables"] = self.bq_client.list_tables()
-            
+                schema_info["available_tables"] = await asyncio.to_thread(self.bq_client.list_tables)
+
             return schema_info
-            
+
         except Exception as e:
             logger.error("Schema retrieval failed", error=str(e))
             return {
                 "tables": {},
-                "available_tables": self.bq_client.list_tables(),
+                "available_tables": await asyncio.to_thread(self.bq_client.list_tables),
                 "error": str(e)
             }
     
@@ -184,8 +199,21 @@ class QueryAgent(BaseAgent):
         Returns:
             Generated SQL query
         """
+        # Keyed on the deployment plus everything the prompt is built
+        # from (context is not part of the prompt); hits skip the LLM
+        # round trip and survive restarts
+        cache = get_agent_cache()
+        key = cache.make_key(
+            "generate_sql", settings.azure_openai_deployment_name,
+            query, analysis, schema_info or {}
+        )
+        cached_sql = cache.get(key)
+        if cached_sql is not None:
+            return cached_sql
+
         # Use LLM for SQL generation - no fallback to hardcoded patterns
         sql_query = await self.llm_client.generate_sql_query(query, schema_info or {}, analysis)
+        cache.set(key, sql_query)
         return sql_query
     
     async def _format_results(self, query_result: Dict[str, Any], original_query: str, 
@@ -210,9 +238,12 @@ class QueryAgent(BaseAgent):
                 "insights": []
             }
         
-        # Use LLM for summary and insights generation - no fallback
-        summary = await self.llm_client.generate_summary(query_result, original_query)
-        insights = await self.llm_client.generate_insights(query_result, original_query)
+        # Use LLM for summary and insights generation - no fallback. The two
+        # calls are independent, so their round trips overlap.
+        summary, insights = await asyncio.gather(
+            self.llm_client.generate_summary(query_result, original_query),
+            self.llm_client.generate_insights(query_result, original_query)
+        )
         
         return {
             "summary": summary,
@@ -2,18 +2,28 @@
 Chat API routes for handling user queries and responses.
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from typing import Dict, Any, Optional
 from datetime import datetime
 
-from app.models.chat import ChatRequest, ChatResponse
+from app.models.chat import ChatRequest, ChatResponse, SummaryStreamRequest
 from app.core.agent_manager import agent_manager
 from app.core.session_manager import session_manager
+from app.utils.azure_openai_client import get_azure_client
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 router = APIRouter()
 
+# Serialized once at import time; the chat error path copies this template and
+# overrides the dynamic fields instead of validating a fresh ChatResponse.
+_ERROR_RESPONSE_TEMPLATE = ChatResponse(
+    response="",
+    session_id="",
+    timestamp=datetime(1970, 1, 1),
+).model_dump(mode="json")
+
 
 @router.post("/", response_model=ChatResponse)
 async def chat_with_agent(request: ChatRequest):
@@ -27,21 +37,24 @@ async def chat_with_agent(request: ChatRequest):
         Chat response with agent's reply and analysis
     """
     try:
+        # Capture the request timestamp once and reuse it across the handler
+        now = datetime.utcnow()
+
         # Get or create session
         session_id = request.session_id
         if not session_id:
             session_id = session_manager.create_session(request.user_id)
-        
+
         # Validate session exists
         session = session_manager.get_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
-        
+
         # Prepare context
         context = request.context or {}
         context.update({
             "user_id": request.user_id,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": now.isoformat()
         })
         
         # Execute query through agent manager
@@ -59,16 +72,18 @@ async def chat_with_agent(request: ChatRequest):
             if agent_response.error:
                 error_message = agent_response.error.error_message
             
-            return ChatResponse(
+            payload = _ERROR_RESPONSE_TEMPLATE.copy()
+            payload.update(
                 response=error_message,
                 session_id=session_id,
-                timestamp=datetime.utcnow(),
+                timestamp=now.isoformat(),
                 agent_metadata={
                     "agent_id": agent_response.agent_id,
                     "status": "error",
-                    "error": agent_response.error.dict() if agent_response.error else None
+                    "error": agent_response.error.model_dump(mode="json") if agent_response.error else None
                 }
             )
+            return ORJSONResponse(payload)
         
         # Extract synthesized results
         synthesized_result = agent_response.result.get("synthesized_result", {})
@@ -77,7 +92,7 @@ async def chat_with_agent(request: ChatRequest):
         response = ChatResponse(
             response=synthesized_result.get("user_response", "Query processed successfully."),
             session_id=session_id,
-            timestamp=datetime.utcnow(),
+            timestamp=now,
             agent_metadata={
                 "agent_id": agent_response.agent_id,
                 "agent_type": "coordinator_agent",
@@ -122,6 +137,28 @@ async def chat_with_agent(request: ChatRequest):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.post("/summary/stream")
+async def stream_summary(request: SummaryStreamRequest):
+    """
+    Stream a natural language summary of query results.
+
+    Tokens are forwarded to the client as the model produces them, so the
+    first words of a long summary arrive in milliseconds instead of after
+    the full completion. The non-streaming summary stays available through
+    the regular chat flow.
+
+    Args:
+        request: Original query and the query results to summarize
+
+    Returns:
+        Server-sent text stream of summary fragments
+    """
+    return StreamingResponse(
+        get_azure_client().generate_summary_stream(request.query_result, request.message),
+        media_type="text/event-stream"
+    )
+
+
 @router.post("/session", response_model=Dict[str, Any])
 async def create_session(user_id: Optional[str] = None):
     """
@@ -148,14 +185,22 @@ async def create_session(user_id: Optional[str] = None):
         raise HTTPException(status_code=500, detail="Failed to create session")
 
 
+def _session_etag(session_id: str) -> str:
+    """Build a weak ETag from the session's mutation version."""
+    return f'W/"{session_id}-{session_manager.get_session_version(session_id)}"'
+
+
 @router.get("/session/{session_id}", response_model=Dict[str, Any])
-async def get_session_info(session_id: str):
+async def get_session_info(session_id: str, request: Request, response: Response):
     """
     Get information about a specific session.
-    
+
+    Supports conditional requests: polling clients sending If-None-Match get
+    an empty 304 back when the session hasn't changed.
+
     Args:
         session_id: Session identifier
-        
+
     Returns:
         Session information
     """
@@ -163,10 +208,16 @@ async def get_session_info(session_id: str):
         session = session_manager.get_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
-        
+
+        # Return early when the client already has the current version
+        etag = _session_etag(session_id)
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304)
+        response.headers["ETag"] = etag
+
         # Get conversation history
         history = session_manager.get_conversation_history(session_id, limit=50)
-        
+
         return {
             "session_id": session_id,
             "user_id": session.user_id,
@@ -209,14 +260,18 @@ async def delete_session(session_id: str):
 
 
 @router.get("/session/{session_id}/history", response_model=Dict[str, Any])
-async def get_conversation_history(session_id: str, limit: Optional[int] = 50):
+async def get_conversation_history(session_id: str, request: Request, response: Response,
+                                   limit: Optional[int] = 50):
     """
     Get conversation history for a session.
-    
+
+    Supports conditional requests via If-None-Match, mirroring
+    get_session_info.
+
     Args:
         session_id: Session identifier
         limit: Maximum number of messages to return
-        
+
     Returns:
         Conversation history
     """
@@ -224,7 +279,12 @@ async def get_conversation_history(session_id: str, limit: Optional[int] = 50):
         session = session_manager.get_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
-        
+
+        etag = _session_etag(session_id)
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304)
+        response.headers["ETag"] = etag
+
         history = session_manager.get_conversation_history(session_id, limit=limit)
         
         return {
@@ -2,11 +2,15 @@
 Health check endpoints for monitoring application status.
 """
 
-from fastapi import APIRouter, Depends
-from datetime import datetime
-from typing import Dict, Any, List, Optional
+import asyncio
+import time
+from functools import lru_cache
 
-from app.config.settings import settings
+from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Tuple
+
+from app.config.settings import SETTINGS_SNAPSHOT
 from app.utils.bigquery_client import BigQueryClient
 from app.utils.logger import get_logger
 
@@ -14,184 +18,329 @@ logger = get_logger(__name__)
 router = APIRouter()
 
 
+@lru_cache(maxsize=1)
+def _bq() -> BigQueryClient:
+    """Process-wide BigQuery client; constructing one re-runs Google auth."""
+    return BigQueryClient()
+
+# Probe endpoints are polled every few seconds; cache the formatted timestamp
+# for one second so repeated probes don't re-allocate datetime objects/strings.
+_timestamp_cache: tuple = (0.0, "")
+
+
+def _utcnow_iso() -> str:
+    """Return the current UTC time as an ISO string, cached for one second."""
+    global _timestamp_cache
+    now = time.monotonic()
+    cached_at, cached_value = _timestamp_cache
+    if now - cached_at >= 1.0 or not cached_value:
+        # now(timezone.utc) avoids the deprecated utcnow(); second precision
+        # is plenty for probe timestamps and formats faster
+        _timestamp_cache = (now, datetime.now(timezone.utc).isoformat(timespec="seconds"))
+    return _timestamp_cache[1]
+
+
+# Everything except the timestamp is constant for the process lifetime, so
+# the payload skeleton is built once at import.
+_HEALTHY_TEMPLATE = {
+    "status": "healthy",
+    "version": "1.0.0",
+    "environment": SETTINGS_SNAPSHOT.environment
+}
+
+
 @router.get("/")
 async def health_check() -> Dict[str, Any]:
     """Basic health check endpoint."""
-    return {
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "version": "1.0.0",
-        "environment": settings.environment
-    }
+    return {**_HEALTHY_TEMPLATE, "timestamp": _utcnow_iso()}
+
+
+# Readiness probes fire every few seconds; issuing a live BigQuery call per
+# probe is overkill. /ready answers from the last good probe (refreshed by a
+# background task) plus a cheap credential-expiry check; /ready/deep still
+# performs the live table listing for callers that want a real round-trip.
+_READY_REFRESH_SECONDS = 30.0
+_last_good_probe = 0.0
+_last_tables_available = 0
+_ready_refresh_task: Optional["asyncio.Task"] = None
+
+
+async def _probe_bigquery() -> int:
+    """Run the live BigQuery table listing and record the good probe."""
+    global _last_good_probe, _last_tables_available
+    tables = await asyncio.to_thread(_bq().list_tables)
+    _last_tables_available = len(tables)
+    _last_good_probe = time.monotonic()
+    return _last_tables_available
+
+
+def _credentials_fresh() -> bool:
+    """Check the cached Google credential is valid for at least a minute."""
+    creds = getattr(_bq().client, "_credentials", None)
+    expiry = getattr(creds, "expiry", None)
+    if expiry is None:
+        # Non-expiring credentials (service accounts refresh transparently)
+        return True
+    return (expiry - datetime.utcnow()).total_seconds() > 60.0
+
+
+async def _refresh_readiness_loop() -> None:
+    """Keep the readiness probe warm so /ready never blocks on BigQuery."""
+    while True:
+        await asyncio.sleep(_READY_REFRESH_SECONDS)
+        try:
+            await _probe_bigquery()
+        except Exception as e:
+            logger.warning("Background readiness probe failed", error=str(e))
+
+# Schema/metadata responses change rarely; serve them from a TTL cache keyed
+# by the normalized table-name tuple so repeat lookups skip BigQuery entirely.
+# Cold-cache misses for the same key are coalesced: concurrent requests all
+# await the single in-flight BigQuery call instead of issuing their own.
+_SCHEMA_CACHE_TTL_SECONDS = 300.0
+_schema_cache: Dict[Tuple[str, Optional[Tuple[str, ...]]], Tuple[float, Dict[str, Any]]] = {}
+_schema_inflight: Dict[Tuple[str, Optional[Tuple[str, ...]]], "asyncio.Task"] = {}
+
+
+def parse_tables(table_names: Optional[str] = None) -> Optional[Tuple[str, ...]]:
+    """
+    Parse the comma-separated `table_names` query parameter.
+
+    Shared via Depends so each handler gets the split/strip work done once,
+    and the result is a hashable tuple usable directly as a cache key. Names
+    are deduplicated and sorted so equivalent requests such as "a,b" and
+    "b, a" share one cache entry. Case is preserved: BigQuery table names
+    are case-sensitive by default, so lowercasing would silently turn a
+    lookup for "Sales" into a miss.
+
+    Args:
+        table_names: Comma-separated list of table names (optional)
+
+    Returns:
+        Canonical tuple of table names, or None when the parameter is empty
+    """
+    if not table_names:
+        return None
+    names = {name.strip() for name in table_names.split(",") if name.strip()}
+    return tuple(sorted(names)) if names else None
+
+
+async def _cached_schema_fetch(kind: str, tables: Optional[Tuple[str, ...]], fetch) -> Dict[str, Any]:
+    """
+    Serve a schema/metadata lookup from the TTL cache, fetching on miss.
+
+    Args:
+        kind: Cache namespace ("schema", "summary", "metadata")
+        tables: Optional tuple of table names (part of the cache key)
+        fetch: Callable invoked with `tables` on a worker thread on cache miss
+
+    Returns:
+        The (possibly cached) fetch result
+    """
+    key = (kind, tables)
+    now = time.monotonic()
+
+    entry = _schema_cache.get(key)
+    if entry and now - entry[0] < _SCHEMA_CACHE_TTL_SECONDS:
+        return entry[1]
+
+    # Single-flight: the first miss launches the upstream call, every
+    # concurrent miss for the same key awaits that one task.
+    task = _schema_inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(asyncio.to_thread(fetch, tables))
+        _schema_inflight[key] = task
+        task.add_done_callback(lambda _t, _key=key: _schema_inflight.pop(_key, None))
+
+    result = await task
+    if "error" not in result:
+        _schema_cache[key] = (time.monotonic(), result)
+    return result
 
 
 @router.get("/ready")
 async def readiness_check() -> Dict[str, Any]:
-    """Readiness check including external dependencies."""
+    """Readiness check (lite): served from the last good background probe."""
+    global _ready_refresh_task
+    if _ready_refresh_task is None:
+        # Lazily start the background refresh on the first probe; create_task
+        # needs a running event loop, which import time doesn't have
+        _ready_refresh_task = asyncio.create_task(_refresh_readiness_loop())
+
     try:
-        # Test BigQuery connection
-        bq_client = BigQueryClient()
-        tables = bq_client.list_tables()
+        if (time.monotonic() - _last_good_probe < _READY_REFRESH_SECONDS
+                and _credentials_fresh()):
+            tables_available = _last_tables_available
+        else:
+            # Cold start or stale probe: fall back to the live check
+            tables_available = await _probe_bigquery()
 
         return {
             "status": "ready",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _utcnow_iso(),
             "dependencies": {
                 "bigquery": "connected",
-                "tables_available": len(tables)
+                "tables_available": tables_available
             },
-            "environment": settings.environment
+            "environment": SETTINGS_SNAPSHOT.environment
         }
     except Exception as e:
         logger.error("Readiness check failed", error=str(e))
+        # 503 lets orchestrators take the instance out of rotation; the
+        # app-level HTTPException handler renders the payload
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "status": "not_ready",
+                "timestamp": _utcnow_iso(),
+                "dependencies": {
+                    "bigquery": "disconnected",
+                    "error": str(e)
+                },
+                "environment": SETTINGS_SNAPSHOT.environment
+            }
+        )
+
+
+@router.get("/ready/deep")
+async def readiness_check_deep() -> Dict[str, Any]:
+    """Readiness check (deep): always performs the live BigQuery call."""
+    try:
+        tables_available = await _probe_bigquery()
         return {
-            "status": "not_ready",
-            "timestamp": datetime.utcnow().isoformat(),
+            "status": "ready",
+            "timestamp": _utcnow_iso(),
             "dependencies": {
-                "bigquery": "disconnected",
-                "error": str(e)
+                "bigquery": "connected",
+                "tables_available": tables_available
             },
-            "environment": settings.environment
+            "environment": SETTINGS_SNAPSHOT.environment
         }
+    except Exception as e:
+        logger.error("Deep readiness check failed", error=str(e))
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "status": "not_ready",
+                "timestamp": _utcnow_iso(),
+                "dependencies": {
+                    "bigquery": "disconnected",
+                    "error": str(e)
+                },
+                "environment": SETTINGS_SNAPSHOT.environment
+            }
+        )
+
+
+# The liveness payload has a constant shape; rebuild it at most once per
+# second and hand the same dict to every probe in between.
+_live_payload_cache: Tuple[float, Optional[Dict[str, Any]]] = (0.0, None)
 
 
 @router.get("/live")
 async def liveness_check() -> Dict[str, Any]:
     """Liveness check for Kubernetes health probes."""
-    return {
-        "status": "alive",
-        "timestamp": datetime.utcnow().isoformat()
-    }
+    global _live_payload_cache
+    now = time.monotonic()
+    cached_at, payload = _live_payload_cache
+    if payload is None or now - cached_at >= 1.0:
+        payload = {
+            "status": "alive",
+            "timestamp": _utcnow_iso()
+        }
+        _live_payload_cache = (now, payload)
+    return payload
 
 
 @router.get("/schema")
-async def get_schema_info(table_names: Optional[str] = None) -> Dict[str, Any]:
+async def get_schema_info(tables: Optional[Tuple[str, ...]] = Depends(parse_tables)) -> Dict[str, Any]:
     """
     Get comprehensive schema information from INFORMATION_SCHEMA.
-    
+
     Args:
-        table_names: Comma-separated list of table names (optional)
-        
+        tables: Parsed table names from the `table_names` query parameter
+
     Returns:
         Comprehensive schema information
     """
-    try:
-        bq_client = BigQueryClient()
-        
-        # Parse table names if provided
-        tables = None
-        if table_names:
-            tables = [name.strip() for name in table_names.split(",")]
-        
-        # Get comprehensive schema information
-        schema_info = bq_client.get_comprehensive_schema_info(tables)
-        
-        if "error" in schema_info:
-            return {
-                "success": False,
-                "error": schema_info["error"],
-                "timestamp": datetime.utcnow().isoformat()
-            }
-        
-        return {
-            "success": True,
-            "schema_info": schema_info,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-    except Exception as e:
-        logger.error("Schema info retrieval failed", error=str(e))
+    # Unexpected failures propagate to the app-level exception handler
+    now_iso = datetime.utcnow().isoformat()
+
+    # Get comprehensive schema information (TTL-cached)
+    schema_info = await _cached_schema_fetch("schema", tables, _bq().get_comprehensive_schema_info)
+
+    if "error" in schema_info:
         return {
             "success": False,
-            "error": str(e),
-            "timestamp": datetime.utcnow().isoformat()
+            "error": schema_info["error"],
+            "timestamp": now_iso
         }
 
+    return {
+        "success": True,
+        "schema_info": schema_info,
+        "timestamp": now_iso
+    }
+
 
 @router.get("/schema/summary")
-async def get_schema_summary(table_names: Optional[str] = None) -> Dict[str, Any]:
+async def get_schema_summary(tables: Optional[Tuple[str, ...]] = Depends(parse_tables)) -> Dict[str, Any]:
     """
     Get schema summary optimized for LLM context.
-    
+
     Args:
-        table_names: Comma-separated list of table names (optional)
-        
+        tables: Parsed table names from the `table_names` query parameter
+
     Returns:
         Schema summary for LLM prompts
     """
-    try:
-        bq_client = BigQueryClient()
-        
-        # Parse table names if provided
-        tables = None
-        if table_names:
-            tables = [name.strip() for name in table_names.split(",")]
-        
-        # Get schema summary
-        schema_summary = bq_client.get_table_schema_summary(tables)
-        
-        if "error" in schema_summary:
-            return {
-                "success": False,
-                "error": schema_summary["error"],
-                "timestamp": datetime.utcnow().isoformat()
-            }
-        
-        return {
-            "success": True,
-            "schema_summary": schema_summary,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-    except Exception as e:
-        logger.error("Schema summary retrieval failed", error=str(e))
+    # Unexpected failures propagate to the app-level exception handler
+    now_iso = datetime.utcnow().isoformat()
+
+    # Get schema summary (TTL-cached)
+    schema_summary = await _cached_schema_fetch("summary", tables, _bq().get_table_schema_summary)
+
+    if "error" in schema_summary:
         return {
             "success": False,
-            "error": str(e),
-            "timestamp": datetime.utcnow().isoformat()
+            "error": schema_summary["error"],
+            "timestamp": now_iso
         }
 
+    return {
+        "success": True,
+        "schema_summary": schema_summary,
+        "timestamp": now_iso
+    }
+
 
 @router.get("/metadata")
-async def get_table_metadata(table_names: Optional[str] = None) -> Dict[str, Any]:
+async def get_table_metadata(tables: Optional[Tuple[str, ...]] = Depends(parse_tables)) -> Dict[str, Any]:
     """
     Get table metadata including row counts, sizes, and creation dates.
-    
+
     Args:
-        table_names: Comma-separated list of table names (optional)
-        
+        tables: Parsed table names from the `table_names` query parameter
+
     Returns:
         Table metadata information
     """
-    try:
-        bq_client = BigQueryClient()
-        
-        # Parse table names if provided
-        tables = None
-        if table_names:
-            tables = [name.strip() for name in table_names.split(",")]
-        
-        # Get table metadata
-        metadata = bq_client.get_table_metadata(tables)
-        
-        if "error" in metadata:
-            return {
-                "success": False,
-                "error": metadata["error"],
-                "timestamp": datetime.utcnow().isoformat()
-            }
-        
-        return {
-            "success": True,
-            "metadata": metadata,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-    except Exception as e:
-        logger.error("Table metadata retrieval failed", error=str(e))
+    # Unexpected failures propagate to the app-level exception handler
+    now_iso = datetime.utcnow().isoformat()
+
+    # Get table metadata (TTL-cached)
+    metadata = await _cached_schema_fetch("metadata", tables, _bq().get_table_metadata)
+
+    if "error" in metadata:
         return {
             "success": False,
-            "error": str(e),
-            "timestamp": datetime.utcnow().isoformat()
+            "error": metadata["error"],
+            "timestamp": now_iso
         }
 
+    return {
+        "success": True,
+        "metadata": metadata,
+        "timestamp": now_iso
+    }
+
@@ -3,6 +3,7 @@ Application settings and configuration management.
 """
 
 import os
+from dataclasses import dataclass
 from functools import lru_cache
 from typing import Optional
 from pydantic_settings import BaseSettings
@@ -32,6 +33,9 @@ class Settings(BaseSettings):
     # Security
     secret_key: str = Field(..., env="SECRET_KEY")
     access_token_expire_minutes: int = Field(30, env="ACCESS_TOKEN_EXPIRE_MINUTES")
+    # Comma-separated allow-lists; "*" keeps the permissive development default
+    cors_origins: str = Field("*", env="CORS_ORIGINS")
+    allowed_hosts: str = Field("*", env="ALLOWED_HOSTS")
     
     # Database Configuration
     database_url: str = Field("sqlite:///./agentic_app.db", env="DATABASE_URL")
@@ -39,8 +43,11 @@ class Settings(BaseSettings):
     # Agent Configuration
     max_agent_iterations: int = Field(5, env="MAX_AGENT_ITERATIONS")
     agent_timeout_seconds: int = Field(300, env="AGENT_TIMEOUT_SECONDS")
+    max_parallel_agents: int = Field(8, env="MAX_PARALLEL_AGENTS")
     enable_query_optimization: bool = Field(True, env="ENABLE_QUERY_OPTIMIZATION")
     enable_impact_analysis: bool = Field(True, env="ENABLE_IMPACT_ANALYSIS")
+    max_conversation_history: int = Field(200, env="MAX_CONVERSATION_HISTORY")
+    thread_pool_size: int = Field(100, env="THREAD_POOL_SIZE")
     
     # BigQuery Configuration
     bigquery_max_results: int = Field(10000, env="BIGQUERY_MAX_RESULTS")
@@ -50,6 +57,16 @@ class Settings(BaseSettings):
         env_file = ".env"
         case_sensitive = False
 
+    @property
+    def cors_origin_list(self) -> list:
+        """CORS origins as a list, parsed once from the comma-separated env value."""
+        return [origin.strip() for origin in self.cors_origins.split(",") if origin.strip()]
+
+    @property
+    def allowed_host_list(self) -> list:
+        """Trusted hosts as a list, parsed once from the comma-separated env value."""
+        return [host.strip() for host in self.allowed_hosts.split(",") if host.strip()]
+
 
 @lru_cache()
 def get_settings() -> Settings:
@@ -59,3 +76,26 @@ def get_settings() -> Settings:
 
 # Global settings instance
 settings = get_settings()
+
+
+@dataclass(frozen=True, slots=True)
+class SettingsSnapshot:
+    """Immutable snapshot of the settings read on hot request paths.
+
+    Plain slotted attribute access is cheaper than going through the
+    pydantic model on every probe; settings are static for the process
+    lifetime anyway.
+    """
+
+    environment: str
+    log_level: str
+    bigquery_max_results: int
+    bigquery_timeout_seconds: int
+
+
+SETTINGS_SNAPSHOT = SettingsSnapshot(
+    environment=settings.environment,
+    log_level=settings.log_level,
+    bigquery_max_results=settings.bigquery_max_results,
+    bigquery_timeout_seconds=settings.bigquery_timeout_seconds,
+)
@@ -2,8 +2,18 @@
 Core business logic package for the agentic BigQuery application.
 """
 
-from .agent_manager import AgentManager
-from .session_manager import SessionManager
-
 __all__ = ["AgentManager", "SessionManager"]
 
+# PEP 562 lazy re-exports: agent_manager imports the agent classes, and the
+# agent modules import app.core.session_manager. Eager imports here turned
+# that into a circular import for anything importing an agent module
+# directly (the test suite, scripts); resolving on attribute access breaks
+# the cycle and keeps `import app.core` cheap.
+def __getattr__(name):
+    if name == "AgentManager":
+        from .agent_manager import AgentManager
+        return AgentManager
+    if name == "SessionManager":
+        from .session_manager import SessionManager
+        return SessionManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,8 +3,12 @@ Agent manager for handling agent lifecycle and coordination.
 """
 
 import uuid
+import weakref
+from collections import deque
+from dataclasses import dataclass
+from itertools import islice
 from typing import Dict, Any, Optional, List
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 from app.agents.coordinator_agent import CoordinatorAgent
 from app.models.agent import AgentResponse
@@ -14,14 +18,127 @@ from app.core.session_manager import session_manager
 logger = get_logger(__name__)
 
 
+@dataclass(slots=True)
+class HistoryRow:
+    """Precomputed view of a completed agent response.
+
+    All the derived values the read paths need (enum strings, ISO
+    timestamps, serialized error) are pure functions of the immutable
+    response, so they are computed once at insert instead of on every
+    history or status read.
+    """
+
+    session_id: str
+    request_id: str
+    agent_type_str: str
+    state_str: str
+    created_at: datetime
+    created_at_iso: str
+    updated_at_iso: str
+    duration_ms: Optional[float]
+    success: bool
+    error_dict: Optional[Dict[str, Any]]
+
+    @classmethod
+    def from_response(cls, response: AgentResponse) -> "HistoryRow":
+        """Build a row from a finished agent response."""
+        return cls(
+            session_id=response.session_id,
+            request_id=response.request_id,
+            agent_type_str=response.agent_type.value,
+            state_str=response.state.value,
+            created_at=response.created_at,
+            created_at_iso=response.created_at.isoformat(),
+            updated_at_iso=response.updated_at.isoformat(),
+            duration_ms=response.total_duration_ms,
+            success=response.is_successful(),
+            error_dict=response.error.model_dump(mode="json") if response.error else None
+        )
+
+
 class AgentManager:
     """Manages agent lifecycle and coordination."""
-    
+
+    # History is bounded at insert time instead of relying on periodic
+    # cleanup scans: entries past the size cap or older than the max age are
+    # evicted from the front of the columns in amortized O(1) per insert.
+    max_history_entries = 10_000
+    history_max_age = timedelta(hours=24)
+
     def __init__(self):
         """Initialize agent manager."""
-        self.active_agents: Dict[str, CoordinatorAgent] = {}
-        self.agent_history: Dict[str, AgentResponse] = {}
-        
+        # Weak values: an agent whose request died without reaching the
+        # explicit removal below is dropped automatically instead of being
+        # pinned in memory forever.
+        self.active_agents: "weakref.WeakValueDictionary[str, CoordinatorAgent]" = weakref.WeakValueDictionary()
+        self.agent_history: Dict[str, HistoryRow] = {}
+        # History entries are appended in completion order, which is already
+        # chronological, so no sort is needed at read time. _history_order
+        # keeps (agent_id, created_at) oldest-first for eviction; _by_session
+        # indexes agent ids newest-first per session, so get_agent_history is
+        # O(limit) regardless of history size.
+        self._history_order: deque = deque()
+        self._by_session: Dict[str, deque] = {}
+        # Running statistics counters, updated on insert/evict so
+        # get_statistics never rescans the stored responses.
+        self._success_count = 0
+        self._duration_sum_ms = 0.0
+        self._duration_count = 0
+
+    def _record_history(self, agent_id: str, response: AgentResponse) -> None:
+        """Store a completed agent response and index it for retrieval."""
+        row = HistoryRow.from_response(response)
+        self.agent_history[agent_id] = row
+        self._history_order.append((agent_id, row.created_at))
+        self._by_session.setdefault(row.session_id, deque()).appendleft(agent_id)
+        if row.success:
+            self._success_count += 1
+        if row.duration_ms:
+            self._duration_sum_ms += row.duration_ms
+            self._duration_count += 1
+        self._evict_expired()
+
+    def _pop_oldest_history_entry(self) -> None:
+        """Remove the oldest history entry from the indexes and the map."""
+        agent_id, _ = self._history_order.popleft()
+        row = self.agent_history.pop(agent_id, None)
+        if row is not None:
+            # The oldest entry of a session sits at the right end of its index
+            session_index = self._by_session.get(row.session_id)
+            if session_index:
+                session_index.pop()
+                if not session_index:
+                    del self._by_session[row.session_id]
+            if row.success:
+                self._success_count -= 1
+            if row.duration_ms:
+                self._duration_sum_ms -= row.duration_ms
+                self._duration_count -= 1
+
+    def _evict_expired(self, max_age: Optional[timedelta] = None) -> int:
+        """
+        Evict history entries that are expired or over the size cap.
+
+        Args:
+            max_age: Maximum entry age (defaults to history_max_age)
+
+        Returns:
+            Number of entries evicted
+        """
+        # Aware cutoff to match the aware created_at stamps on responses
+        cutoff = datetime.now(timezone.utc) - (self.history_max_age if max_age is None else max_age)
+        evicted = 0
+
+        while self._history_order and self._history_order[0][1] < cutoff:
+            self._pop_oldest_history_entry()
+            evicted += 1
+
+        while len(self._history_order) > self.max_history_entries:
+            self._pop_oldest_history_entry()
+            evicted += 1
+
+        return evicted
+
     async def execute_query(self, session_id: str, user_query: str, context: Dict[str, Any] = None,
                           enable_optimization: bool = True, enable_impact_analysis: bool = True) -> AgentResponse:
         """
@@ -37,7 +154,7 @@ class AgentManager:
         Returns:
             Agent response
         """
-        request_id = str(uuid.uuid4())
+        request_id = uuid.uuid4().hex
         context = context or {}
         
         try:
@@ -57,7 +174,7 @@ class AgentManager:
             response = await coordinator.run_with_timeout(input_data)
             
             # Store in history
-            self.agent_history[coordinator.agent_id] = response
+            self._record_history(coordinator.agent_id, response)
             
             # Remove from active agents
             if coordinator.agent_id in self.active_agents:
@@ -123,15 +240,15 @@ class AgentManager:
         
         # Check history
         if agent_id in self.agent_history:
-            response = self.agent_history[agent_id]
+            row = self.agent_history[agent_id]
             return {
                 "agent_id": agent_id,
                 "status": "completed",
-                "state": response.state.value,
-                "start_time": response.created_at.isoformat(),
-                "end_time": response.updated_at.isoformat(),
-                "duration_ms": response.total_duration_ms,
-                "success": response.is_successful()
+                "state": row.state_str,
+                "start_time": row.created_at_iso,
+                "end_time": row.updated_at_iso,
+                "duration_ms": row.duration_ms,
+                "success": row.success
             }
         
         return None
@@ -145,7 +262,8 @@ class AgentManager:
         """
         active_agents = []
         
-        for agent_id, agent in self.active_agents.items():
+        # Snapshot the weak dict so entries collected mid-iteration are safe
+        for agent_id, agent in list(self.active_agents.items()):
             active_agents.append({
                 "agent_id": agent_id,
                 "session_id": agent.session_id,
@@ -168,57 +286,52 @@ class AgentManager:
         Returns:
             List of agent history entries
         """
+        # Indexes are already newest-first (per session) or oldest-first
+        # (global order), so the page is sliced in O(limit) without sorting.
+        if session_id:
+            page = islice(self._by_session.get(session_id, ()), limit)
+        else:
+            page = (agent_id for agent_id, _ in islice(reversed(self._history_order), limit))
+
         history = []
-        
-        for agent_id, response in self.agent_history.items():
-            if session_id and response.session_id != session_id:
-                continue
-            
+        for agent_id in page:
+            row = self.agent_history[agent_id]
             history.append({
                 "agent_id": agent_id,
-                "session_id": response.session_id,
-                "request_id": response.request_id,
-                "agent_type": response.agent_type.value,
-                "state": response.state.value,
-                "created_at": response.created_at.isoformat(),
-                "updated_at": response.updated_at.isoformat(),
-                "duration_ms": response.total_duration_ms,
-                "success": response.is_successful(),
-                "error": response.error.dict() if response.error else None
+                "session_id": row.session_id,
+                "request_id": row.request_id,
+                "agent_type": row.agent_type_str,
+                "state": row.state_str,
+                "created_at": row.created_at_iso,
+                "updated_at": row.updated_at_iso,
+                "duration_ms": row.duration_ms,
+                "success": row.success,
+                "error": row.error_dict
             })
-        
-        # Sort by creation time (newest first) and limit results
-        history.sort(key=lambda x: x["created_at"], reverse=True)
-        return history[:limit]
+
+        return history
     
     def cleanup_old_history(self, max_age_hours: int = 24) -> int:
         """
         Clean up old agent history.
-        
+
+        History is already evicted incrementally on insert, so this only pops
+        entries older than the requested age from the front of the columns.
+
         Args:
             max_age_hours: Maximum age in hours
-            
+
         Returns:
             Number of entries cleaned up
         """
-        cutoff_time = datetime.utcnow().replace(hour=datetime.utcnow().hour - max_age_hours)
-        cleaned_count = 0
-        
-        agent_ids_to_remove = []
-        
-        for agent_id, response in self.agent_history.items():
-            if response.created_at < cutoff_time:
-                agent_ids_to_remove.append(agent_id)
-        
-        for agent_id in agent_ids_to_remove:
-            del self.agent_history[agent_id]
-            cleaned_count += 1
-        
+        cleaned_count = self._evict_expired(max_age=timedelta(hours=max_age_hours))
+
         if cleaned_count > 0:
-            logger.info(f"Cleaned up {cleaned_count} old agent history entries")
-        
+            # Structured field instead of an eagerly-formatted f-string
+            logger.info("Cleaned up old agent history entries", count=cleaned_count)
+
         return cleaned_count
-    
+
     def get_statistics(self) -> Dict[str, Any]:
         """
         Get agent manager statistics.
@@ -228,15 +341,11 @@ class AgentManager:
         """
         total_agents = len(self.agent_history)
         active_agents = len(self.active_agents)
-        
-        # Calculate success rate
-        successful_agents = sum(1 for response in self.agent_history.values() if response.is_successful())
-        success_rate = (successful_agents / total_agents * 100) if total_agents > 0 else 0
-        
-        # Calculate average execution time
-        execution_times = [response.total_duration_ms for response in self.agent_history.values() if response.total_duration_ms]
-        avg_execution_time = sum(execution_times) / len(execution_times) if execution_times else 0
-        
+
+        # Served from the running counters maintained at insert/evict time
+        success_rate = (self._success_count / total_agents * 100) if total_agents > 0 else 0
+        avg_execution_time = (self._duration_sum_ms / self._duration_count) if self._duration_count else 0
+
         return {
             "total_agents_executed": total_agents,
             "active_agents": active_agents,
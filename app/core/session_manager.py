@@ -2,297 +2,392 @@
 Session management for user conversations and context.
 """
 
+import heapq
+import time
 import uuid
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from itertools import islice
 from typing import Dict, Any, Optional, List
-from collections import defaultdict
 
-from app.models.agent import AgentContext
+from app.models.agent import AgentContext, MAX_CONVERSATION_HISTORY
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+class ConversationHistory:
+    """Bounded conversation history stored as parallel columns.
+
+    Keeping role/content/timestamp in separate ring buffers (structure of
+    arrays) avoids allocating a three-key dict per message; timestamps are
+    stored as raw time.time() floats and formatted to ISO strings only when
+    the history is actually read.
+    """
+
+    __slots__ = ("roles", "contents", "timestamps")
+
+    def __init__(self, maxlen: Optional[int] = None):
+        if maxlen is None:
+            maxlen = MAX_CONVERSATION_HISTORY
+        self.roles: deque = deque(maxlen=maxlen)
+        self.contents: deque = deque(maxlen=maxlen)
+        self.timestamps: deque = deque(maxlen=maxlen)
+
+    def __len__(self) -> int:
+        return len(self.roles)
+
+    @property
+    def maxlen(self) -> Optional[int]:
+        return self.roles.maxlen
+
+    def append(self, role: str, content: str) -> bool:
+        """Append a message; returns True when the history grew."""
+        grew = self.maxlen is None or len(self.roles) < self.maxlen
+        self.roles.append(role)
+        self.contents.append(content)
+        self.timestamps.append(time.time())
+        return grew
+
+    def tail(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Materialize the newest `limit` messages as dicts (all if None)."""
+        start = 0
+        if limit and limit < len(self.roles):
+            start = len(self.roles) - limit
+        return [
+            {
+                "role": role,
+                "content": content,
+                "timestamp": datetime.utcfromtimestamp(ts).isoformat()
+            }
+            for role, content, ts in zip(
+                islice(self.roles, start, None),
+                islice(self.contents, start, None),
+                islice(self.timestamps, start, None)
+            )
+        ]
+
+
+@dataclass(slots=True)
+class SessionEntry:
+    """Session context plus activity bookkeeping, stored as a single record.
+
+    Timestamps are `time.monotonic()` floats: TTL expiry only needs elapsed
+    time, and the monotonic clock is cheaper than datetime allocation and
+    immune to wall-clock adjustments.
+    """
+
+    context: AgentContext
+    created_at: float
+    last_activity: float
+    history: ConversationHistory = field(default_factory=ConversationHistory)
+    user_id: Optional[str] = None
+    version: int = 0
+
+
 class SessionManager:
     """Manages user sessions and conversation context."""
-    
+
     def __init__(self):
         """Initialize session manager."""
-        self.sessions: Dict[str, AgentContext] = {}
-        self.session_metadata: Dict[str, Dict[str, Any]] = {}
+        # One dict lookup per operation: context and activity metadata live
+        # in the same entry, so they can never fall out of sync.
+        self._sessions: Dict[str, SessionEntry] = {}
         self.session_timeout = timedelta(hours=24)  # 24 hour timeout
-    
+        # Lazy min-heap of (last_activity, session_id): every activity update
+        # pushes a fresh stamp and stale entries are discarded on pop, so
+        # cleanup stops at the first still-fresh session instead of scanning
+        # every entry.
+        self._expiry_heap: List[tuple] = []
+        # Running message total, maintained on append/delete so
+        # get_session_stats does not rescan every session's history
+        self._total_messages = 0
+
     def create_session(self, user_id: Optional[str] = None) -> str:
         """
         Create a new session.
-        
+
         Args:
             user_id: Optional user identifier
-            
+
         Returns:
             Session ID
         """
-        session_id = str(uuid.uuid4())
-        
-        self.sessions[session_id] = AgentContext(
-            session_id=session_id,
-            user_id=user_id,
-            conversation_history=[],
-            schema_info=None,
-            user_preferences={},
-            context_variables={}
+        session_id = uuid.uuid4().hex
+        now = time.monotonic()
+
+        # conversation_history is left to its default factory so the bounded
+        # ring buffer (deque maxlen) is preserved.
+        self._sessions[session_id] = SessionEntry(
+            context=AgentContext(
+                session_id=session_id,
+                user_id=user_id,
+                schema_info=None,
+                user_preferences={},
+                context_variables={}
+            ),
+            created_at=now,
+            last_activity=now,
+            user_id=user_id
         )
-        
-        self.session_metadata[session_id] = {
-            "created_at": datetime.utcnow(),
-            "last_activity": datetime.utcnow(),
-            "user_id": user_id
-        }
-        
+        heapq.heappush(self._expiry_heap, (now, session_id))
+
         logger.info("Created new session", session_id=session_id, user_id=user_id)
         return session_id
-    
+
     def get_session(self, session_id: str) -> Optional[AgentContext]:
         """
         Get session context.
-        
+
         Args:
             session_id: Session identifier
-            
+
         Returns:
             Session context or None if not found
         """
-        if session_id not in self.sessions:
+        entry = self._sessions.get(session_id)
+        if entry is None:
             return None
-        
-        # Update last activity
-        if session_id in self.session_metadata:
-            self.session_metadata[session_id]["last_activity"] = datetime.utcnow()
-        
-        return self.sessions[session_id]
-    
+
+        # Update last activity (reads don't bump the mutation version)
+        entry.last_activity = time.monotonic()
+        heapq.heappush(self._expiry_heap, (entry.last_activity, session_id))
+
+        return entry.context
+
+    def _touch_session(self, session_id: str) -> None:
+        """Record activity on a session and bump its mutation version."""
+        entry = self._sessions.get(session_id)
+        if entry is not None:
+            entry.last_activity = time.monotonic()
+            entry.version += 1
+            heapq.heappush(self._expiry_heap, (entry.last_activity, session_id))
+
+    def get_session_version(self, session_id: str) -> int:
+        """
+        Get the mutation version for a session.
+
+        The version increments on every session mutation, so it can be used
+        as a cheap change detector (e.g. for ETag generation).
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Current session version (0 if unknown)
+        """
+        entry = self._sessions.get(session_id)
+        return entry.version if entry else 0
+
     def update_session(self, session_id: str, **kwargs) -> bool:
         """
         Update session context.
-        
+
         Args:
             session_id: Session identifier
             **kwargs: Fields to update
-            
+
         Returns:
             True if updated successfully
         """
-        if session_id not in self.sessions:
+        entry = self._sessions.get(session_id)
+        if entry is None:
             return False
-        
-        session = self.sessions[session_id]
-        
+
+        session = entry.context
+
         for key, value in kwargs.items():
             if hasattr(session, key):
                 setattr(session, key, value)
-        
-        # Update last activity
-        if session_id in self.session_metadata:
-            self.session_metadata[session_id]["last_activity"] = datetime.utcnow()
-        
+
+        self._touch_session(session_id)
+
         logger.debug("Updated session", session_id=session_id, updates=kwargs)
         return True
-    
+
     def add_message_to_history(self, session_id: str, role: str, content: str) -> bool:
         """
         Add a message to the conversation history.
-        
+
         Args:
             session_id: Session identifier
             role: Message role (user/assistant)
             content: Message content
-            
+
         Returns:
             True if added successfully
         """
-        if session_id not in self.sessions:
+        entry = self._sessions.get(session_id)
+        if entry is None:
             return False
-        
-        session = self.sessions[session_id]
-        session.conversation_history.append({
-            "role": role,
-            "content": content,
-            "timestamp": datetime.utcnow().isoformat()
-        })
-        
-        # Update last activity
-        if session_id in self.session_metadata:
-            self.session_metadata[session_id]["last_activity"] = datetime.utcnow()
-        
+
+        # A full ring buffer drops its oldest message on append
+        if entry.history.append(role, content):
+            self._total_messages += 1
+
+        self._touch_session(session_id)
+
         logger.debug("Added message to history", session_id=session_id, role=role)
         return True
-    
+
     def get_conversation_history(self, session_id: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Get conversation history for a session.
-        
+
         Args:
             session_id: Session identifier
             limit: Maximum number of messages to return
-            
+
         Returns:
             List of conversation messages
         """
-        if session_id not in self.sessions:
+        entry = self._sessions.get(session_id)
+        if entry is None:
             return []
-        
-        history = self.sessions[session_id].conversation_history
-        
-        if limit:
-            history = history[-limit:]
-        
-        return history
-    
+
+        # Dicts and ISO timestamps are materialized lazily, for the tail only
+        return entry.history.tail(limit)
+
     def update_schema_info(self, session_id: str, schema_info: Dict[str, Any]) -> bool:
         """
         Update schema information for a session.
-        
+
         Args:
             session_id: Session identifier
             schema_info: Database schema information
-            
+
         Returns:
             True if updated successfully
         """
         return self.update_session(session_id, schema_info=schema_info)
-    
+
     def update_user_preferences(self, session_id: str, preferences: Dict[str, Any]) -> bool:
         """
         Update user preferences for a session.
-        
+
         Args:
             session_id: Session identifier
             preferences: User preferences
-            
+
         Returns:
             True if updated successfully
         """
-        if session_id not in self.sessions:
+        entry = self._sessions.get(session_id)
+        if entry is None:
             return False
-        
-        session = self.sessions[session_id]
-        session.user_preferences.update(preferences)
-        
-        # Update last activity
-        if session_id in self.session_metadata:
-            self.session_metadata[session_id]["last_activity"] = datetime.utcnow()
-        
+
+        entry.context.user_preferences.update(preferences)
+
+        self._touch_session(session_id)
+
         return True
-    
+
     def set_context_variable(self, session_id: str, key: str, value: Any) -> bool:
         """
         Set a context variable for a session.
-        
+
         Args:
             session_id: Session identifier
             key: Variable key
             value: Variable value
-            
+
         Returns:
             True if set successfully
         """
-        if session_id not in self.sessions:
+        entry = self._sessions.get(session_id)
+        if entry is None:
             return False
-        
-        session = self.sessions[session_id]
-        session.context_variables[key] = value
-        
-        # Update last activity
-        if session_id in self.session_metadata:
-            self.session_metadata[session_id]["last_activity"] = datetime.utcnow()
-        
+
+        entry.context.context_variables[key] = value
+
+        self._touch_session(session_id)
+
         return True
-    
+
     def get_context_variable(self, session_id: str, key: str) -> Optional[Any]:
         """
         Get a context variable for a session.
-        
+
         Args:
             session_id: Session identifier
             key: Variable key
-            
+
         Returns:
             Variable value or None if not found
         """
-        if session_id not in self.sessions:
+        entry = self._sessions.get(session_id)
+        if entry is None:
             return None
-        
-        session = self.sessions[session_id]
-        return session.context_variables.get(key)
-    
+
+        return entry.context.context_variables.get(key)
+
     def delete_session(self, session_id: str) -> bool:
         """
         Delete a session.
-        
+
         Args:
             session_id: Session identifier
-            
+
         Returns:
             True if deleted successfully
         """
-        if session_id in self.sessions:
-            del self.sessions[session_id]
-        
-        if session_id in self.session_metadata:
-            del self.session_metadata[session_id]
-        
+        entry = self._sessions.pop(session_id, None)
+        if entry is not None:
+            self._total_messages -= len(entry.history)
+
         logger.info("Deleted session", session_id=session_id)
         return True
-    
+
     def cleanup_expired_sessions(self) -> int:
         """
         Clean up expired sessions.
-        
+
         Returns:
             Number of sessions cleaned up
         """
-        now = datetime.utcnow()
-        expired_sessions = []
-        
-        for session_id, metadata in self.session_metadata.items():
-            if now - metadata["last_activity"] > self.session_timeout:
-                expired_sessions.append(session_id)
-        
-        for session_id in expired_sessions:
+        now = time.monotonic()
+        timeout_seconds = self.session_timeout.total_seconds()
+        cleaned = 0
+
+        # Pop stamps until the smallest one is still fresh; each activity
+        # update pushed a newer stamp, so an entry whose stamp no longer
+        # matches its session is stale and simply discarded.
+        while self._expiry_heap and now - self._expiry_heap[0][0] > timeout_seconds:
+            stamp, session_id = heapq.heappop(self._expiry_heap)
+            entry = self._sessions.get(session_id)
+            if entry is None or entry.last_activity != stamp:
+                continue
             self.delete_session(session_id)
-        
-        if expired_sessions:
-            logger.info("Cleaned up expired sessions", count=len(expired_sessions))
-        
-        return len(expired_sessions)
-    
+            cleaned += 1
+
+        if cleaned:
+            logger.info("Cleaned up expired sessions", count=cleaned)
+
+        return cleaned
+
     def get_session_stats(self) -> Dict[str, Any]:
         """
         Get session statistics.
-        
+
         Returns:
             Session statistics
         """
-        total_sessions = len(self.sessions)
+        total_sessions = len(self._sessions)
         active_sessions = 0
-        total_messages = 0
-        
-        for session_id, session in self.sessions.items():
-            if session_id in self.session_metadata:
-                metadata = self.session_metadata[session_id]
-                if datetime.utcnow() - metadata["last_activity"] < timedelta(hours=1):
-                    active_sessions += 1
-            
-            total_messages += len(session.conversation_history)
-        
+        activity_cutoff = time.monotonic() - 3600.0
+
+        for entry in self._sessions.values():
+            if entry.last_activity > activity_cutoff:
+                active_sessions += 1
+
         return {
             "total_sessions": total_sessions,
             "active_sessions": active_sessions,
-            "total_messages": total_messages,
+            "total_messages": self._total_messages,
             "session_timeout_hours": self.session_timeout.total_seconds() / 3600
         }
 
 
 # Global session manager instance
 session_manager = SessionManager()
-
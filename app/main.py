@@ -4,18 +4,72 @@ Main FastAPI application entry point for the agentic BigQuery app.
 
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+import anyio.to_thread
+import asyncio
+import logging
+import re
 import time
-import uuid
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 
 from app.config.settings import settings
+from app.utils.azure_openai_client import get_azure_client
+from app.utils.fastuuid import new_request_id
 from app.utils.logger import get_logger
 from app.api.routes import chat, agents, health
 
 # Initialize logger
 logger = get_logger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup/shutdown lifecycle."""
+    logger.info(
+        "Starting Agentic BigQuery App",
+        environment=settings.environment,
+        host=settings.app_host,
+        port=settings.app_port
+    )
+
+    # Blocking BigQuery calls run via asyncio.to_thread, which uses the
+    # event loop's default executor (capped around min(32, cpus + 4)), so
+    # replace it with one sized for our workload. Starlette's sync-route
+    # offloading goes through anyio's 40-token limiter instead; raise it
+    # to match so neither path serializes under load.
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(
+        ThreadPoolExecutor(max_workers=settings.thread_pool_size, thread_name_prefix="app-worker")
+    )
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.thread_pool_size
+
+    # Warm the upstream connections so the first user request doesn't pay
+    # the TLS handshake + auth round trips; failures are non-fatal and just
+    # mean the first request warms the pool instead.
+    try:
+        await asyncio.wait_for(get_azure_client().client.models.list(), timeout=5)
+    except Exception as e:
+        logger.warning("Azure OpenAI warmup failed", error=str(e))
+    try:
+        # Also seeds the readiness probe cache
+        await asyncio.wait_for(health._probe_bigquery(), timeout=5)
+    except Exception as e:
+        logger.warning("BigQuery warmup failed", error=str(e))
+
+    # Build the OpenAPI schema up front in dev so the first /docs load
+    # doesn't pay for the full route + model scan
+    if app.openapi_url:
+        app.openapi()
+
+    yield
+
+    logger.info("Shutting down Agentic BigQuery App")
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Agentic BigQuery App",
@@ -23,57 +77,124 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs" if settings.environment == "development" else None,
     redoc_url="/redoc" if settings.environment == "development" else None,
+    # No schema endpoint in prod: building it scans every route and model
+    # and pins the result in memory for the process lifetime
+    openapi_url="/openapi.json" if settings.environment == "development" else None,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # Add middleware
 app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    TrustedHostMiddleware,
+    allowed_hosts=settings.allowed_host_list
 )
 
+# Compress large JSON payloads (chat responses, session history). The minimum
+# size keeps tiny responses such as health probes uncompressed.
 app.add_middleware(
-    TrustedHostMiddleware,
-    allowed_hosts=["*"]  # Configure appropriately for production
+    GZipMiddleware,
+    minimum_size=1024,
+    compresslevel=5
 )
 
 
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    """Add processing time header to responses."""
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
+# Accept proxy-supplied request ids after a cheap shape check; compiled once
+# at import so the hot path pays a single match call.
+_VALID_REQUEST_ID_RE = re.compile(r"^[\w\-]{1,255}$")
+
+# Liveness/readiness probes hit /health constantly and don't need request
+# ids or timing headers; compared against raw_path to skip the str decode.
+_HEALTH_PREFIX = b"/health"
+
+
+class RequestContextMiddleware:
+    """Pure-ASGI middleware for the request id and processing-time headers.
+
+    A raw ASGI callable avoids BaseHTTPMiddleware's per-request task group
+    and response rebuffering; the only per-request work is one header scan,
+    two perf_counter() reads and two appended header tuples.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("raw_path", b"").startswith(_HEALTH_PREFIX):
+            await self.app(scope, receive, send)
+            return
+
+        # Reuse the id stamped by a fronting proxy/load balancer when
+        # present, preserving end-to-end traceability
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                candidate = value.decode("latin-1")
+                if _VALID_REQUEST_ID_RE.match(candidate):
+                    request_id = candidate
+                break
+        if request_id is None:
+            request_id = new_request_id()
+
+        scope.setdefault("state", {})["request_id"] = request_id
+        request_id_header = request_id.encode("latin-1")
+        start_time = time.perf_counter()
 
+        async def send_with_context(message):
+            if message["type"] == "http.response.start":
+                process_time = time.perf_counter() - start_time
+                message["headers"].append((b"x-process-time", str(process_time).encode("latin-1")))
+                message["headers"].append((b"x-request-id", request_id_header))
+            await send(message)
 
-@app.middleware("http")
-async def add_request_id(request: Request, call_next):
-    """Add request ID to all requests for tracking."""
-    request_id = str(uuid.uuid4())
-    request.state.request_id = request_id
-    response = await call_next(request)
-    response.headers["X-Request-ID"] = request_id
-    return response
+        await self.app(scope, receive, send_with_context)
+
+
+# Sits just inside CORS: every request that reaches routing (and therefore
+# any handler reading request.state.request_id) has passed through here
+app.add_middleware(RequestContextMiddleware)
+
+# Outermost so OPTIONS preflights are answered before the request-context
+# middleware spends a request id and timing headers on them. An explicit
+# origin allow-list keeps CORS on the exact-match path instead of the
+# wildcard handling.
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=settings.cors_origin_list,
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+
+# Whether error records survive the configured log level; computed once so an
+# exception storm doesn't pay for str(exc) and traceback rendering only to
+# have the filtering bound logger drop the records.
+_ERRORS_LOGGED = getattr(logging, settings.log_level.upper(), logging.INFO) <= logging.ERROR
+
+# Deep stacks (recursive agent steps, middleware chains) make full tracebacks
+# expensive to format and noisy to store; the top frames carry the signal.
+_TRACEBACK_FRAME_LIMIT = 20
 
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler."""
-    request_id = getattr(request.state, "request_id", "unknown")
-    logger.error(
-        "Unhandled exception occurred",
-        request_id=request_id,
-        path=request.url.path,
-        method=request.method,
-        error=str(exc),
-        exc_info=True
-    )
+    # Health-probe requests bypass the context middleware, so fall back
+    request_id = getattr(request.state, "request_id", None)
+    if _ERRORS_LOGGED:
+        logger.error(
+            "Unhandled exception occurred",
+            request_id=request_id,
+            path=request.url.path,
+            method=request.method,
+            error=str(exc),
+            exception="".join(
+                traceback.format_exception(type(exc), exc, exc.__traceback__, limit=_TRACEBACK_FRAME_LIMIT)
+            )
+        )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
@@ -86,7 +207,7 @@ async def global_exception_handler(request: Request, exc: Exception):
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     """HTTP exception handler."""
-    request_id = getattr(request.state, "request_id", "unknown")
+    request_id = getattr(request.state, "request_id", None)
     logger.warning(
         "HTTP exception occurred",
         request_id=request_id,
@@ -96,7 +217,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
         detail=exc.detail
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": exc.detail,
@@ -112,23 +233,6 @@ app.include_router(chat.router, prefix="/api/v1/chat", tags=["chat"])
 app.include_router(agents.router, prefix="/api/v1/agents", tags=["agents"])
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Application startup event."""
-    logger.info(
-        "Starting Agentic BigQuery App",
-        environment=settings.environment,
-        host=settings.app_host,
-        port=settings.app_port
-    )
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Application shutdown event."""
-    logger.info("Shutting down Agentic BigQuery App")
-
-
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -2,10 +2,27 @@
 Agent-related data models for the agentic application.
 """
 
-from datetime import datetime
+from collections import deque
+from datetime import datetime, timezone
 from enum import Enum
-from typing import Optional, List, Dict, Any, Union
-from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Any, Deque, Union
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.config.settings import settings
+
+# Conversation history per session is bounded so long-lived sessions keep a
+# flat memory footprint; the deque drops the oldest message on overflow.
+MAX_CONVERSATION_HISTORY = settings.max_conversation_history
+
+
+def _utc_now() -> datetime:
+    """Shared timestamp factory for model defaults.
+
+    datetime.now(timezone.utc) takes the C fast path and produces aware
+    datetimes; datetime.utcnow() is deprecated and does extra Gregorian
+    math per call.
+    """
+    return datetime.now(timezone.utc)
 
 
 class AgentState(str, Enum):
@@ -20,6 +37,13 @@ class AgentState(str, Enum):
     TIMEOUT = "timeout"
 
 
+# States a run can end in; a frozenset makes the hot "is it done yet"
+# membership checks O(1) set lookups instead of scanning a fresh list.
+# Defined outside the class body so enum machinery doesn't try to turn
+# it into a member.
+AgentState.TERMINAL = frozenset({AgentState.COMPLETED, AgentState.ERROR, AgentState.TIMEOUT})
+
+
 class AgentType(str, Enum):
     """Enumeration of agent types."""
     
@@ -35,19 +59,19 @@ class AgentError(BaseModel):
     error_type: str = Field(..., description="Type of error")
     error_message: str = Field(..., description="Detailed error message")
     error_code: Optional[str] = Field(None, description="Error code")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Error timestamp")
+    timestamp: datetime = Field(default_factory=_utc_now, description="Error timestamp")
     context: Dict[str, Any] = Field(default_factory=dict, description="Error context")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "error_type": "query_execution_error",
-                "error_message": "BigQuery table not found: sales_data",
-                "error_code": "BQ_TABLE_NOT_FOUND",
-                "timestamp": "2024-01-15T10:30:00Z",
-                "context": {"table_name": "sales_data", "project": "my-project"}
-            }
+    # Leaf record: frozen skips assignment validation machinery entirely
+    model_config = ConfigDict(frozen=True, extra="ignore", json_schema_extra={
+        "example": {
+            "error_type": "query_execution_error",
+            "error_message": "BigQuery table not found: sales_data",
+            "error_code": "BQ_TABLE_NOT_FOUND",
+            "timestamp": "2024-01-15T10:30:00Z",
+            "context": {"table_name": "sales_data", "project": "my-project"}
         }
+    })
 
 
 class AgentStep(BaseModel):
@@ -62,18 +86,17 @@ class AgentStep(BaseModel):
     output: Optional[Dict[str, Any]] = Field(None, description="Step output")
     error: Optional[AgentError] = Field(None, description="Step error if any")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "step_name": "sql_generation",
-                "step_type": "nlp_to_sql",
-                "start_time": "2024-01-15T10:30:00Z",
-                "end_time": "2024-01-15T10:30:05Z",
-                "duration_ms": 5000.0,
-                "status": "success",
-                "output": {"sql_query": "SELECT * FROM sales WHERE year = 2024"}
-            }
+    model_config = ConfigDict(extra="ignore", json_schema_extra={
+        "example": {
+            "step_name": "sql_generation",
+            "step_type": "nlp_to_sql",
+            "start_time": "2024-01-15T10:30:00Z",
+            "end_time": "2024-01-15T10:30:05Z",
+            "duration_ms": 5000.0,
+            "status": "success",
+            "output": {"sql_query": "SELECT * FROM sales WHERE year = 2024"}
         }
+    })
 
 
 class AgentResponse(BaseModel):
@@ -94,27 +117,30 @@ class AgentResponse(BaseModel):
     error: Optional[AgentError] = Field(None, description="Agent error if any")
     
     # Metadata
-    created_at: datetime = Field(default_factory=datetime.utcnow, description="Creation timestamp")
-    updated_at: datetime = Field(default_factory=datetime.utcnow, description="Last update timestamp")
+    created_at: datetime = Field(default_factory=_utc_now, description="Creation timestamp")
+    updated_at: datetime = Field(default_factory=_utc_now, description="Last update timestamp")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
-    
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "agent_id": "agent_123",
-                "agent_type": "query_agent",
-                "state": "completed",
-                "session_id": "session_456",
-                "request_id": "req_789",
-                "total_duration_ms": 15000.0,
-                "result": {
-                    "sql_query": "SELECT SUM(revenue) FROM sales WHERE year = 2024",
-                    "data": [{"total_revenue": 1500000.00}]
-                },
-                "created_at": "2024-01-15T10:30:00Z",
-                "updated_at": "2024-01-15T10:30:15Z"
-            }
+
+    def is_successful(self) -> bool:
+        """Check if the agent run completed without errors."""
+        return self.state == AgentState.COMPLETED and self.error is None
+
+    model_config = ConfigDict(extra="ignore", json_schema_extra={
+        "example": {
+            "agent_id": "agent_123",
+            "agent_type": "query_agent",
+            "state": "completed",
+            "session_id": "session_456",
+            "request_id": "req_789",
+            "total_duration_ms": 15000.0,
+            "result": {
+                "sql_query": "SELECT SUM(revenue) FROM sales WHERE year = 2024",
+                "data": [{"total_revenue": 1500000.00}]
+            },
+            "created_at": "2024-01-15T10:30:00Z",
+            "updated_at": "2024-01-15T10:30:15Z"
         }
+    })
 
 
 class AgentContext(BaseModel):
@@ -122,25 +148,27 @@ class AgentContext(BaseModel):
     
     session_id: str = Field(..., description="Session identifier")
     user_id: Optional[str] = Field(None, description="User identifier")
-    conversation_history: List[Dict[str, Any]] = Field(default_factory=list, description="Conversation history")
+    conversation_history: Deque[Dict[str, Any]] = Field(
+        default_factory=lambda: deque(maxlen=MAX_CONVERSATION_HISTORY),
+        description="Conversation history (ring buffer, oldest messages dropped)"
+    )
     schema_info: Optional[Dict[str, Any]] = Field(None, description="Database schema information")
     user_preferences: Dict[str, Any] = Field(default_factory=dict, description="User preferences")
     context_variables: Dict[str, Any] = Field(default_factory=dict, description="Context variables")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "session_id": "session_123",
-                "user_id": "user_456",
-                "conversation_history": [
-                    {"role": "user", "content": "What is the revenue for Q1?"},
-                    {"role": "assistant", "content": "The revenue for Q1 is $500,000."}
-                ],
-                "schema_info": {
-                    "tables": ["sales", "customers", "products"],
-                    "columns": {"sales": ["revenue", "date", "product_id"]}
-                },
-                "user_preferences": {"language": "en", "timezone": "UTC"},
-                "context_variables": {"current_quarter": "Q1", "current_year": 2024}
-            }
+    model_config = ConfigDict(extra="ignore", json_schema_extra={
+        "example": {
+            "session_id": "session_123",
+            "user_id": "user_456",
+            "conversation_history": [
+                {"role": "user", "content": "What is the revenue for Q1?"},
+                {"role": "assistant", "content": "The revenue for Q1 is $500,000."}
+            ],
+            "schema_info": {
+                "tables": ["sales", "customers", "products"],
+                "columns": {"sales": ["revenue", "date", "product_id"]}
+            },
+            "user_preferences": {"language": "en", "timezone": "UTC"},
+            "context_variables": {"current_quarter": "Q1", "current_year": 2024}
         }
+    })
@@ -4,7 +4,9 @@ Chat-related data models for the agentic application.
 
 from datetime import datetime
 from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.models.agent import _utc_now
 
 
 class ChatRequest(BaseModel):
@@ -15,15 +17,28 @@ class ChatRequest(BaseModel):
     context: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Additional context")
     user_id: Optional[str] = Field(None, description="User identifier")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "message": "What is the total revenue for Q1 2024?",
-                "session_id": "session_123",
-                "context": {"department": "sales", "region": "US"},
-                "user_id": "user_456"
-            }
+    model_config = ConfigDict(extra="ignore", json_schema_extra={
+        "example": {
+            "message": "What is the total revenue for Q1 2024?",
+            "session_id": "session_123",
+            "context": {"department": "sales", "region": "US"},
+            "user_id": "user_456"
         }
+    })
+
+
+class SummaryStreamRequest(BaseModel):
+    """Request model for streaming result summaries."""
+
+    message: str = Field(..., description="User's original natural language query")
+    query_result: Dict[str, Any] = Field(..., description="Query execution results to summarize")
+
+    model_config = ConfigDict(extra="ignore", json_schema_extra={
+        "example": {
+            "message": "What is the total revenue for Q1 2024?",
+            "query_result": {"data": [{"total_revenue": 1500000.00}]}
+        }
+    })
 
 
 class QueryResult(BaseModel):
@@ -36,16 +51,15 @@ class QueryResult(BaseModel):
     data_preview: Optional[List[Dict[str, Any]]] = Field(None, description="Preview of query results")
     error_message: Optional[str] = Field(None, description="Error message if query failed")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "sql_query": "SELECT SUM(revenue) FROM sales WHERE quarter = 'Q1' AND year = 2024",
-                "optimized_sql": "SELECT SUM(revenue) FROM sales WHERE quarter = 'Q1' AND year = 2024",
-                "execution_time_ms": 1250.5,
-                "row_count": 1,
-                "data_preview": [{"total_revenue": 1500000.00}]
-            }
+    model_config = ConfigDict(extra="ignore", json_schema_extra={
+        "example": {
+            "sql_query": "SELECT SUM(revenue) FROM sales WHERE quarter = 'Q1' AND year = 2024",
+            "optimized_sql": "SELECT SUM(revenue) FROM sales WHERE quarter = 'Q1' AND year = 2024",
+            "execution_time_ms": 1250.5,
+            "row_count": 1,
+            "data_preview": [{"total_revenue": 1500000.00}]
         }
+    })
 
 
 class ImpactAnalysis(BaseModel):
@@ -57,16 +71,16 @@ class ImpactAnalysis(BaseModel):
     recommendations: List[str] = Field(default_factory=list, description="Recommendations based on analysis")
     confidence_level: float = Field(..., description="Confidence level of the analysis (0-1)")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "impact_score": 0.85,
-                "impact_description": "High impact on revenue metrics",
-                "affected_metrics": ["total_revenue", "average_order_value"],
-                "recommendations": ["Monitor sales trends", "Review pricing strategy"],
-                "confidence_level": 0.92
-            }
+    # Leaf record: frozen skips assignment validation machinery entirely
+    model_config = ConfigDict(frozen=True, extra="ignore", json_schema_extra={
+        "example": {
+            "impact_score": 0.85,
+            "impact_description": "High impact on revenue metrics",
+            "affected_metrics": ["total_revenue", "average_order_value"],
+            "recommendations": ["Monitor sales trends", "Review pricing strategy"],
+            "confidence_level": 0.92
         }
+    })
 
 
 class ChatResponse(BaseModel):
@@ -76,19 +90,18 @@ class ChatResponse(BaseModel):
     query_result: Optional[QueryResult] = Field(None, description="Query execution results if applicable")
     impact_analysis: Optional[ImpactAnalysis] = Field(None, description="Impact analysis if applicable")
     session_id: str = Field(..., description="Session identifier")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Response timestamp")
+    timestamp: datetime = Field(default_factory=_utc_now, description="Response timestamp")
     agent_metadata: Dict[str, Any] = Field(default_factory=dict, description="Metadata about agent processing")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "response": "The total revenue for Q1 2024 is $1,500,000. This represents a 15% increase compared to Q1 2023.",
-                "session_id": "session_123",
-                "timestamp": "2024-01-15T10:30:00Z",
-                "agent_metadata": {
-                    "agent_type": "query_agent",
-                    "processing_steps": ["nlp_understanding", "sql_generation", "query_execution"],
-                    "confidence": 0.95
-                }
+    model_config = ConfigDict(extra="ignore", json_schema_extra={
+        "example": {
+            "response": "The total revenue for Q1 2024 is $1,500,000. This represents a 15% increase compared to Q1 2023.",
+            "session_id": "session_123",
+            "timestamp": "2024-01-15T10:30:00Z",
+            "agent_metadata": {
+                "agent_type": "query_agent",
+                "processing_steps": ["nlp_understanding", "sql_generation", "query_execution"],
+                "confidence": 0.95
             }
         }
+    })
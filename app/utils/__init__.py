@@ -3,11 +3,21 @@ Utility functions and helpers for the agentic application.
 """
 
 from .logger import get_logger
-from .bigquery_client import BigQueryClient
-from .azure_openai_client import AzureOpenAIClient
 
 __all__ = [
     "get_logger",
     "BigQueryClient",
     "AzureOpenAIClient"
 ]
+
+# PEP 562 lazy re-exports: the BigQuery and OpenAI SDKs are heavy imports
+# (httpx, pydantic-core, google auth chain), so they only load when the
+# client classes are actually referenced, not on `import app.utils`.
+def __getattr__(name):
+    if name == "BigQueryClient":
+        from .bigquery_client import BigQueryClient
+        return BigQueryClient
+    if name == "AzureOpenAIClient":
+        from .azure_openai_client import AzureOpenAIClient
+        return AzureOpenAIClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,8 +2,17 @@
 BigQuery client utility for database operations.
 """
 
+import asyncio
+import hashlib
+import queue
+import re
+import threading
 import time
-from typing import List, Dict, Any, Optional, Tuple
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 from google.cloud import bigquery
 from google.cloud.exceptions import GoogleCloudError
 from app.config.settings import settings
@@ -11,55 +20,291 @@ from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Schema and table metadata change rarely but are behind expensive
+# INFORMATION_SCHEMA queries, so results are cached process-wide. Entries in
+# the last few seconds of their TTL are served stale while a single-worker
+# executor refreshes them in the background, so hot keys never pay the
+# round trip inline.
+# Valid BigQuery table identifier: letters, digits and underscores, not
+# starting with a digit, within BigQuery's 1024-char limit. Checked before
+# any name reaches SQL text or spends a round trip on a query that can
+# only fail.
+_IDENT_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]{0,1023}$")
+
+_SCHEMA_CACHE_TTL_SECONDS = 30.0
+_LIST_TABLES_TTL_SECONDS = 10.0
+_REFRESH_MARGIN_SECONDS = 5.0
+
+
+@dataclass(slots=True)
+class TableSchema:
+    """Canonical per-table schema record.
+
+    get_schema_info can be served from INFORMATION_SCHEMA or from the
+    get_table API fallback; both paths emit this shape (via to_dict) so
+    callers never branch on which one produced the data. Fields the
+    fallback cannot know default to None/empty rather than being absent.
+    """
+
+    table_name: str
+    columns: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    column_count: int = 0
+    partitioning_column: Optional[str] = None
+    clustering_fields: List[str] = field(default_factory=list)
+    row_count: Optional[int] = None
+    size_bytes: Optional[int] = None
+    created: Optional[str] = None
+    modified: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Render as the plain dict shape cached and returned to callers."""
+        return {
+            "table_name": self.table_name,
+            "columns": self.columns,
+            "column_count": self.column_count,
+            "partitioning_column": self.partitioning_column,
+            "clustering_fields": self.clustering_fields,
+            "row_count": self.row_count,
+            "size_bytes": self.size_bytes,
+            "created": self.created,
+            "modified": self.modified,
+        }
+
+
+@dataclass(slots=True)
+class _SchemaCacheEntry:
+    """One cached metadata result with its refresh bookkeeping."""
+
+    value: Any
+    fetched_at: float
+    refreshing: bool = False
+
+
+_schema_cache: Dict[Tuple, _SchemaCacheEntry] = {}
+_schema_cache_lock = threading.Lock()
+# Shared by background cache refreshes and the metadata bundle below. The
+# pool is deliberately small: metadata queries are cheap to wait on but
+# easy to rate-limit when fanned out per request.
+_metadata_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="bq-metadata")
+
+# Below this the Storage API's fixed read-session setup costs more than it
+# saves; small results stay on the REST row iterator.
+_STORAGE_API_MIN_BYTES = 10 * 1024 * 1024
+
+# BigQuery on-demand pricing: $5 per TiB scanned, folded to a per-byte rate
+_COST_PER_BYTE: float = 5.0 / (1 << 40)
+
+# Agent loops re-validate the same SQL after cosmetic reformatting, and each
+# dry-run is a full REST round trip. Results are cached under a hash of the
+# whitespace-normalized text, expiring with the schema TTL so validations
+# never outlive the schema they were checked against.
+_VALIDATION_CACHE_MAX_ENTRIES = 512
+_validation_cache: Dict[bytes, Tuple[float, Dict[str, Any]]] = {}
+
+# Micro-batching state for validate_query_batched lives at module level
+# because every agent constructs its own BigQueryClient: per-instance
+# queues would give each request a private window and never coalesce
+# anything. Keyed weakly per event loop since queues and futures are
+# loop-bound (tests spin up loops the production one never sees).
+_validation_batches: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+@lru_cache(maxsize=4)
+def _get_shared_client(project: str) -> bigquery.Client:
+    """
+    One bigquery.Client per project, shared across BigQueryClient instances.
+
+    Constructing a Client runs credential discovery and opens a fresh HTTP
+    connection pool (~100-300ms), which agents previously paid on every
+    instantiation. The shared client keeps TLS connections alive across
+    queries; its session pool is widened so parallel metadata fetches don't
+    queue on the default pool size.
+    """
+    client = bigquery.Client(project=project)
+    try:
+        from requests.adapters import HTTPAdapter
+        client._http.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+    except Exception as e:
+        # Private session layout changed or a non-requests transport: the
+        # default pool still works, just smaller
+        logger.warning("Could not resize BigQuery HTTP pool", error=str(e))
+    return client
+
 
 class BigQueryClient:
     """BigQuery client for executing queries and managing data."""
     
+    # Dry-runs requested by concurrent chats within this window are drained
+    # together and submitted in parallel, amortizing REST round-trip cost.
+    validation_batch_window_seconds = 0.02
+
     def __init__(self):
         """Initialize BigQuery client."""
-        self.client = bigquery.Client(project=settings.google_cloud_project)
+        self.client = _get_shared_client(settings.google_cloud_project)
         self.dataset = settings.bigquery_dataset
         self.max_results = settings.bigquery_max_results
         self.timeout = settings.bigquery_timeout_seconds
-        
-    def execute_query(self, query: str, params: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        self._bqstorage_client = None
+        self._bqstorage_unavailable = False
+
+    def _get_bqstorage_client(self):
+        """
+        Lazily build the BigQuery Storage API read client.
+
+        Returns None when the optional google-cloud-bigquery-storage /
+        pyarrow dependencies are not installed, in which case callers fall
+        back to REST row iteration.
+        """
+        if self._bqstorage_client is None and not self._bqstorage_unavailable:
+            try:
+                from google.cloud import bigquery_storage_v1
+                self._bqstorage_client = bigquery_storage_v1.BigQueryReadClient()
+            except Exception as e:
+                logger.warning("BigQuery Storage API unavailable, using REST results", error=str(e))
+                self._bqstorage_unavailable = True
+        return self._bqstorage_client
+
+    async def validate_query_batched(self, query: str) -> Dict[str, Any]:
+        """
+        Validate a SQL query, micro-batching with other concurrent callers.
+
+        Dry-runs queued within the batching window are submitted together on
+        worker threads, so N concurrent chats pay for one scheduling pass
+        instead of N sequential round trips.
+
+        Args:
+            query: SQL query to validate
+
+        Returns:
+            Validation result (same shape as validate_query)
+        """
+        loop = asyncio.get_running_loop()
+
+        state = _validation_batches.get(loop)
+        if state is None:
+            state = {"queue": asyncio.Queue(), "task": None}
+            _validation_batches[loop] = state
+
+        future: asyncio.Future = loop.create_future()
+        state["queue"].put_nowait((query, future))
+
+        if state["task"] is None or state["task"].done():
+            state["task"] = loop.create_task(self._drain_validation_queue(state["queue"]))
+
+        return await future
+
+    async def _drain_validation_queue(self, validation_queue: asyncio.Queue) -> None:
+        """Collect queued dry-runs window by window until the queue is empty.
+
+        Loops rather than exiting after one window: anything enqueued
+        while a batch's gather is in flight would otherwise strand with
+        its future never resolved. The final empty-check and exit happen
+        in one event-loop step, so an enqueue either lands in the last
+        batch or sees the finished task and starts a new one.
+        """
+        while True:
+            await asyncio.sleep(self.validation_batch_window_seconds)
+
+            batch = []
+            while not validation_queue.empty():
+                batch.append(validation_queue.get_nowait())
+
+            if not batch:
+                return
+
+            results = await asyncio.gather(
+                *(asyncio.to_thread(self.validate_query, query) for query, _ in batch),
+                return_exceptions=True
+            )
+
+            for (_, future), result in zip(batch, results):
+                if future.cancelled():
+                    continue
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def execute_query(self, query: str, params: Optional[List[Dict[str, Any]]] = None,
+                      as_arrow: bool = False, max_bytes: Optional[int] = None,
+                      job_timeout_ms: Optional[int] = None) -> Dict[str, Any]:
         """
         Execute a BigQuery SQL query.
-        
+
+        Large results are read through the Storage API when available, which
+        streams column-batched Arrow data over gRPC instead of paging JSON
+        rows over REST. Small results keep the REST iterator since the
+        Storage API pays a fixed read-session setup cost.
+
         Args:
             query: SQL query to execute
             params: Query parameters (optional)
-            
+            as_arrow: Return the Arrow table in "data" instead of row dicts,
+                skipping the Python dict materialization entirely
+            max_bytes: Per-call maximum_bytes_billed override (default 10GB)
+            job_timeout_ms: Server-side job timeout; BigQuery cancels the
+                job itself instead of the client timing out locally while
+                the job keeps running and billing
+
         Returns:
             Query results and metadata
         """
         start_time = time.time()
-        
+
         try:
             # Configure query job
+            # QueryJobConfig rejects query_parameters=None
             job_config = bigquery.QueryJobConfig(
-                query_parameters=params,
-                maximum_bytes_billed=10 * 1024 * 1024 * 1024,  # 10GB
+                query_parameters=params or [],
+                maximum_bytes_billed=max_bytes if max_bytes is not None else 10 * 1024 * 1024 * 1024,  # 10GB
                 use_query_cache=True
             )
-            
+            if job_timeout_ms is not None:
+                job_config.job_timeout_ms = job_timeout_ms
+
             # Execute query
             query_job = self.client.query(query, job_config=job_config)
-            
+
             # Wait for completion
-            query_job.result(timeout=self.timeout)
-            
+            rows = query_job.result(timeout=self.timeout)
+
             # Get results
-            results = []
-            for row in query_job:
-                results.append(dict(row.items()))
-            
+            arrow_table = None
+            if as_arrow or (query_job.total_bytes_processed or 0) >= _STORAGE_API_MIN_BYTES:
+                bqstorage_client = self._get_bqstorage_client()
+                if bqstorage_client is not None or as_arrow:
+                    try:
+                        arrow_table = rows.to_arrow(bqstorage_client=bqstorage_client)
+                    except Exception as e:
+                        logger.warning("Arrow result download failed, using REST rows", error=str(e))
+
+            if arrow_table is not None:
+                if as_arrow:
+                    results = arrow_table
+                    row_count = arrow_table.num_rows
+                else:
+                    results = arrow_table.to_pylist()
+                    row_count = len(results)
+            else:
+                # Resolve field names once instead of letting Row.items()
+                # walk the schema and allocate key/value tuples per row
+                names = tuple(field.name for field in rows.schema)
+                results = [dict(zip(names, row.values())) for row in rows]
+                row_count = len(results)
+
             execution_time = (time.time() - start_time) * 1000  # Convert to milliseconds
-            
+
+            logger.debug(
+                "Query completed",
+                job_id=query_job.job_id,
+                total_bytes_billed=query_job.total_bytes_billed,
+                execution_time_ms=execution_time
+            )
+
             return {
                 "success": True,
                 "data": results,
-                "row_count": len(results),
+                "row_count": row_count,
                 "execution_time_ms": execution_time,
                 "total_bytes_processed": query_job.total_bytes_processed,
                 "total_bytes_billed": query_job.total_bytes_billed,
@@ -79,24 +324,216 @@ class BigQueryClient:
                 "row_count": 0
             }
     
+    def execute_query_stream(self, query: str, params: Optional[List[Dict[str, Any]]] = None,
+                             initial_page_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """
+        Execute a query and yield row dicts as pages arrive.
+
+        Unlike execute_query, nothing is materialized: the first (small)
+        page is yielded as soon as BigQuery returns it, so row-by-row
+        consumers see their first row in milliseconds instead of after the
+        full download. Page size doubles per round trip up to the
+        configured max_results, amortizing HTTP overhead for large results
+        without giving up the fast first page.
+
+        Args:
+            query: SQL query to execute
+            params: Query parameters (optional)
+            initial_page_size: Rows in the first page
+
+        Yields:
+            Row dictionaries in result order
+        """
+        # QueryJobConfig rejects query_parameters=None
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=params or [],
+            maximum_bytes_billed=10 * 1024 * 1024 * 1024,  # 10GB
+            use_query_cache=True
+        )
+
+        query_job = self.client.query(query, job_config=job_config)
+        query_job.result(timeout=self.timeout, max_results=0)
+
+        destination = query_job.destination
+        if destination is None:
+            # No anonymous result table (e.g. DML/scripts): plain iteration
+            for row in query_job:
+                yield dict(row.items())
+            return
+
+        def fetch_pages() -> Iterator[Tuple[Tuple[str, ...], List[Any]]]:
+            page_size = initial_page_size
+            page_token = None
+            names = None
+            while True:
+                iterator = self.client.list_rows(destination, page_size=page_size, page_token=page_token)
+                if names is None:
+                    names = tuple(field.name for field in iterator.schema)
+                for page in iterator.pages:
+                    yield names, list(page)
+                    break  # One page per list_rows call so the size can grow
+                page_token = iterator.next_page_token
+                if not page_token:
+                    return
+                page_size = min(page_size * 2, self.max_results)
+
+        for names, page in self._prefetch_pages(fetch_pages()):
+            for row in page:
+                yield dict(zip(names, row))
+
+    @staticmethod
+    def _prefetch_pages(pages: Iterator[Any], buffer_size: int = 1) -> Iterator[Any]:
+        """
+        Run a page iterator on a producer thread, one buffer ahead.
+
+        While the consumer builds row dicts for page N, the network round
+        trip for page N+1 is already in flight, overlapping download with
+        processing. The bounded queue caps memory at buffer_size pages;
+        producer exceptions are re-raised on the consuming side. The
+        producer is a daemon thread so an abandoned consumer never keeps
+        the process alive.
+
+        Args:
+            pages: Iterator yielding downloaded pages
+            buffer_size: Pages to fetch ahead of the consumer
+
+        Yields:
+            Pages in fetch order
+        """
+        done = object()
+        buffer: queue.Queue = queue.Queue(maxsize=buffer_size)
+
+        def produce() -> None:
+            try:
+                for page in pages:
+                    buffer.put(page)
+                buffer.put(done)
+            except BaseException as e:
+                buffer.put(e)
+
+        threading.Thread(target=produce, name="bq-page-prefetch", daemon=True).start()
+        while True:
+            item = buffer.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+    def _cached_metadata_fetch(self, key: Tuple, ttl: float, fetch: Callable[[], Any]) -> Any:
+        """
+        Serve a metadata result from the process-wide cache, fetching on miss.
+
+        Entries older than ttl are refetched inline; entries inside the
+        refresh margin are returned stale while one background refresh per
+        key runs on the shared executor. Error results (dicts carrying an
+        "error" key) are never cached, so failures are retried immediately.
+
+        Args:
+            key: Cache key identifying the query shape
+            ttl: Entry lifetime in seconds
+            fetch: Zero-argument callable producing a fresh value
+
+        Returns:
+            Cached or freshly fetched value
+        """
+        now = time.monotonic()
+        with _schema_cache_lock:
+            entry = _schema_cache.get(key)
+            if entry is not None:
+                age = now - entry.fetched_at
+                if age < ttl:
+                    if ttl - _REFRESH_MARGIN_SECONDS < age and not entry.refreshing:
+                        entry.refreshing = True
+                        _metadata_executor.submit(self._refresh_cache_entry, key, fetch)
+                    return entry.value
+                del _schema_cache[key]
+
+        value = fetch()
+        if not self._is_error_value(value):
+            with _schema_cache_lock:
+                _schema_cache[key] = _SchemaCacheEntry(value, time.monotonic())
+        return value
+
+    def _refresh_cache_entry(self, key: Tuple, fetch: Callable[[], Any]) -> None:
+        """Refresh one cache entry in the background, keeping stale on failure."""
+        try:
+            value = fetch()
+        except Exception as e:
+            logger.warning("Background schema refresh failed", key=str(key), error=str(e))
+            value = None
+
+        with _schema_cache_lock:
+            if value is not None and not self._is_error_value(value):
+                _schema_cache[key] = _SchemaCacheEntry(value, time.monotonic())
+            else:
+                entry = _schema_cache.get(key)
+                if entry is not None:
+                    entry.refreshing = False
+
+    @staticmethod
+    def _is_error_value(value: Any) -> bool:
+        """Whether a fetch result represents a failure and must not be cached."""
+        return (isinstance(value, dict) and "error" in value) or value == [] or value == ""
+
+    def invalidate_metadata_cache(self, table_names: Optional[List[str]] = None) -> None:
+        """
+        Drop cached schema/metadata entries.
+
+        Args:
+            table_names: Only drop entries covering these tables (None drops all)
+        """
+        with _schema_cache_lock:
+            if table_names is None:
+                _schema_cache.clear()
+                return
+            wanted = set(table_names)
+            for key in list(_schema_cache):
+                tables = key[-1]
+                # Keys with tables=None cover the whole dataset
+                if tables is None or wanted.intersection(tables):
+                    del _schema_cache[key]
+
     def get_comprehensive_schema_info(self, table_names: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Get comprehensive schema information from INFORMATION_SCHEMA.COLUMN_FIELD_PATHS.
-        
+
+        Results are cached process-wide for a short TTL with background
+        refresh near expiry, since the underlying INFORMATION_SCHEMA scan
+        dominates the schema-summary path.
+
         Args:
             table_names: Optional list of specific table names to fetch schema for
-            
+
         Returns:
             Comprehensive schema information including table, column, data type, and description
         """
+        # Names only ever travel as query parameters, but rejecting bad
+        # ones here avoids caching and round-tripping queries that cannot
+        # match anything
+        if table_names:
+            invalid = [name for name in table_names if not _IDENT_RE.match(name)]
+            if invalid:
+                logger.warning("Rejected invalid table names", table_names=invalid)
+                return {"error": f"Invalid table name(s): {', '.join(invalid)}"}
+
+        key = ("schema", self.dataset, tuple(sorted(table_names)) if table_names else None)
+        return self._cached_metadata_fetch(
+            key, _SCHEMA_CACHE_TTL_SECONDS,
+            lambda: self._fetch_comprehensive_schema_info(table_names)
+        )
+
+    @staticmethod
+    def _tables_param(table_names: Optional[List[str]]) -> bigquery.ArrayQueryParameter:
+        """Canonical @tables array parameter (empty array means no filter)."""
+        return bigquery.ArrayQueryParameter("tables", "STRING", sorted(table_names) if table_names else [])
+
+    def _fetch_comprehensive_schema_info(self, table_names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Fetch comprehensive schema information from INFORMATION_SCHEMA uncached."""
         try:
-            # Build the query to get comprehensive schema information
-            if table_names:
-                table_filter = "', '".join(table_names)
-                where_clause = f"WHERE table_name IN ('{table_filter}')"
-            else:
-                where_clause = ""
-            
+            # Parameterized filter keeps the SQL text byte-identical across
+            # calls, so BigQuery's query cache can answer repeats; sorted
+            # names canonicalize the parameter for the same reason.
             query = f"""
             SELECT 
                 table_name,
@@ -109,11 +546,11 @@ class BigQueryClient:
                 is_partitioning_column,
                 clustering_fields
             FROM `{settings.google_cloud_project}.{self.dataset}.INFORMATION_SCHEMA.COLUMN_FIELD_PATHS`
-            {where_clause}
+            WHERE (ARRAY_LENGTH(@tables) = 0 OR table_name IN UNNEST(@tables))
             ORDER BY table_name, ordinal_position
             """
-            
-            result = self.execute_query(query)
+
+            result = self.execute_query(query, params=[self._tables_param(table_names)])
             
             if not result["success"]:
                 logger.error("Failed to fetch comprehensive schema info", error=result.get("error"))
@@ -129,41 +566,47 @@ class BigQueryClient:
                 "fetched_at": time.time()
             }
             
+            # Single pass with the nested dicts bound locally: the old loop
+            # re-resolved schema_info["tables"][table_name] four times per
+            # row, which dominates for schemas with thousands of columns.
+            tables = schema_info["tables"]
+            total_columns = 0
             for row in result["data"]:
                 table_name = row["table_name"]
                 column_name = row["column_name"]
-                
-                if table_name not in schema_info["tables"]:
-                    schema_info["tables"][table_name] = {
-                        "table_name": table_name,
-                        "columns": {},
-                        "column_count": 0,
-                        "partitioning_column": None,
-                        "clustering_fields": []
-                    }
-                
-                schema_info["tables"][table_name]["columns"][column_name] = {
+
+                table = tables.get(table_name)
+                if table is None:
+                    # Same constructor as the API fallback, so both paths
+                    # stay key-for-key identical
+                    table = tables[table_name] = TableSchema(table_name=table_name).to_dict()
+
+                is_partitioning = row["is_partitioning_column"] == "YES"
+                clustering_fields = row["clustering_fields"]
+
+                table["columns"][column_name] = {
                     "column_name": column_name,
                     "data_type": row["data_type"],
                     "is_nullable": row["is_nullable"] == "YES",
                     "column_default": row["column_default"],
                     "description": row["description"] or "",
                     "ordinal_position": row["ordinal_position"],
-                    "is_partitioning_column": row["is_partitioning_column"] == "YES",
-                    "clustering_fields": row["clustering_fields"] or []
+                    "is_partitioning_column": is_partitioning,
+                    "clustering_fields": clustering_fields or []
                 }
-                
-                schema_info["tables"][table_name]["column_count"] += 1
-                schema_info["total_columns"] += 1
-                
+                total_columns += 1
+
                 # Track partitioning and clustering info
-                if row["is_partitioning_column"] == "YES":
-                    schema_info["tables"][table_name]["partitioning_column"] = column_name
-                
-                if row["clustering_fields"]:
-                    schema_info["tables"][table_name]["clustering_fields"] = row["clustering_fields"]
-            
-            schema_info["total_tables"] = len(schema_info["tables"])
+                if is_partitioning:
+                    table["partitioning_column"] = column_name
+                if clustering_fields:
+                    table["clustering_fields"] = clustering_fields
+
+            # Column counts are tallied once at the end, not per row
+            for table in tables.values():
+                table["column_count"] = len(table["columns"])
+            schema_info["total_columns"] = total_columns
+            schema_info["total_tables"] = len(tables)
             
             logger.info("Comprehensive schema info fetched", 
                        tables_count=schema_info["total_tables"], 
@@ -178,50 +621,125 @@ class BigQueryClient:
     def get_table_schema_summary(self, table_names: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Get a summary of table schemas for LLM context.
-        
+
+        The summary is a pure view over the comprehensive schema, so it is
+        cached under its own key with the same TTL/invalidation and only
+        rebuilt when the underlying schema refreshes.
+
         Args:
             table_names: Optional list of specific table names
-            
+
         Returns:
             Schema summary optimized for LLM prompts
         """
+        key = ("summary", self.dataset, tuple(sorted(table_names)) if table_names else None)
+        return self._cached_metadata_fetch(
+            key, _SCHEMA_CACHE_TTL_SECONDS,
+            lambda: self._build_schema_summary(table_names)
+        )
+
+    def get_schema_prompt_text(self, table_names: Optional[List[str]] = None) -> str:
+        """
+        Get the schema as a compact prompt-ready string.
+
+        Downstream LLM calls re-serialized the nested summary dict on every
+        prompt build; this caches the final flat text ("table.column: TYPE
+        - description" lines) so a cache hit costs one dict lookup. Shares
+        the metadata cache TTL and invalidation.
+
+        Args:
+            table_names: Optional list of specific table names
+
+        Returns:
+            One line per column, empty string when the schema is unavailable
+        """
+        key = ("prompt", self.dataset, tuple(sorted(table_names)) if table_names else None)
+        return self._cached_metadata_fetch(
+            key, _SCHEMA_CACHE_TTL_SECONDS,
+            lambda: self._build_schema_prompt_text(table_names)
+        )
+
+    def _build_schema_prompt_text(self, table_names: Optional[List[str]] = None) -> str:
+        """Flatten the schema summary into prompt text."""
+        summary = self.get_table_schema_summary(table_names)
+        if "error" in summary:
+            return ""
+
+        lines = []
+        append = lines.append
+        for table_name, table_info in summary["tables"].items():
+            for col in table_info["columns"]:
+                append(f"{table_name}.{col['name']}: {col['type']} - {col['description']}")
+        return "\n".join(lines)
+
+    def _build_schema_summary(self, table_names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Build the LLM-facing summary from the comprehensive schema."""
         comprehensive_schema = self.get_comprehensive_schema_info(table_names)
-        
+
         if "error" in comprehensive_schema:
             return comprehensive_schema
-        
+
         # Create a simplified summary for LLM context
-        schema_summary = {
-            "project": comprehensive_schema["project"],
-            "dataset": comprehensive_schema["dataset"],
-            "tables": {}
-        }
-        
+        summary_tables = {}
         for table_name, table_info in comprehensive_schema["tables"].items():
-            schema_summary["tables"][table_name] = {
-                "table_name": table_name,
-                "column_count": table_info["column_count"],
-                "columns": []
-            }
-            
+            columns: List[Dict[str, Any]] = []
+            append = columns.append
             # Add column information in a format suitable for LLM prompts
             for col_name, col_info in table_info["columns"].items():
-                column_desc = {
+                data_type = col_info["data_type"]
+                description = col_info["description"] or f"{data_type} column"
+                if col_info["is_partitioning_column"]:
+                    description += " (partitioning column)"
+                append({
                     "name": col_name,
-                    "type": col_info["data_type"],
-                    "description": col_info["description"] or f"{col_info['data_type']} column",
+                    "type": data_type,
+                    "description": description,
                     "nullable": col_info["is_nullable"],
                     "default": col_info["column_default"]
-                }
-                
-                # Add special indicators
-                if col_info["is_partitioning_column"]:
-                    column_desc["description"] += " (partitioning column)"
-                
-                schema_summary["tables"][table_name]["columns"].append(column_desc)
-        
-        return schema_summary
+                })
+
+            summary_tables[table_name] = {
+                "table_name": table_name,
+                "column_count": table_info["column_count"],
+                "columns": columns
+            }
+
+        return {
+            "project": comprehensive_schema["project"],
+            "dataset": comprehensive_schema["dataset"],
+            "tables": summary_tables
+        }
     
+    def get_schema_and_metadata_bundle(self, table_names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Fetch schema info, table metadata and the table list concurrently.
+
+        Callers that need all three today pay three sequential round trips;
+        dispatching them on the shared bounded executor collapses that to
+        the latency of the slowest query. Each part degrades independently
+        to an {"error": ...} entry on failure.
+
+        Args:
+            table_names: Optional list of specific table names
+
+        Returns:
+            Dict with "schema", "metadata" and "tables" entries
+        """
+        futures = {
+            "schema": _metadata_executor.submit(self.get_comprehensive_schema_info, table_names),
+            "metadata": _metadata_executor.submit(self.get_table_metadata, table_names),
+            "tables": _metadata_executor.submit(self.list_tables),
+        }
+
+        bundle = {}
+        for name, future in futures.items():
+            try:
+                bundle[name] = future.result(timeout=self.timeout)
+            except Exception as e:
+                logger.error("Metadata bundle part failed", part=name, error=str(e))
+                bundle[name] = {"error": str(e)}
+        return bundle
+
     def get_schema_info(self, table_name: str) -> Dict[str, Any]:
         """
         Get schema information for a specific table.
@@ -256,28 +774,37 @@ class BigQueryClient:
         try:
             table_id = f"{settings.google_cloud_project}.{self.dataset}.{table_name}"
             table = self.client.get_table(table_id)
-            
-            schema_info = {
-                "table_name": table_name,
-                "columns": {},
-                "column_count": len(table.schema),
-                "row_count": table.num_rows,
-                "size_bytes": table.num_bytes,
-                "created": table.created.isoformat() if table.created else None,
-                "modified": table.modified.isoformat() if table.modified else None
-            }
-            
-            for field in table.schema:
-                schema_info["columns"][field.name] = {
-                    "column_name": field.name,
-                    "data_type": field.field_type,
-                    "mode": field.mode,
-                    "description": field.description or f"{field.field_type} column",
-                    "nullable": field.mode == "NULLABLE"
+
+            partitioning_column = None
+            if table.time_partitioning and table.time_partitioning.field:
+                partitioning_column = table.time_partitioning.field
+            clustering_fields = list(table.clustering_fields or [])
+
+            columns: Dict[str, Dict[str, Any]] = {}
+            for position, schema_field in enumerate(table.schema, start=1):
+                columns[schema_field.name] = {
+                    "column_name": schema_field.name,
+                    "data_type": schema_field.field_type,
+                    "is_nullable": schema_field.mode == "NULLABLE",
+                    "column_default": None,
+                    "description": schema_field.description or "",
+                    "ordinal_position": position,
+                    "is_partitioning_column": schema_field.name == partitioning_column,
+                    "clustering_fields": clustering_fields
                 }
-            
-            return schema_info
-            
+
+            return TableSchema(
+                table_name=table_name,
+                columns=columns,
+                column_count=len(columns),
+                partitioning_column=partitioning_column,
+                clustering_fields=clustering_fields,
+                row_count=table.num_rows,
+                size_bytes=table.num_bytes,
+                created=table.created.isoformat() if table.created else None,
+                modified=table.modified.isoformat() if table.modified else None,
+            ).to_dict()
+
         except GoogleCloudError as e:
             logger.error("Failed to get basic schema info", table_name=table_name, error=str(e))
             return {"error": str(e)}
@@ -285,15 +812,44 @@ class BigQueryClient:
     def list_tables(self) -> List[str]:
         """
         List all tables in the dataset.
-        
+
+        Cached with a shorter TTL than schema info since new tables should
+        become visible quickly.
+
         Returns:
             List of table names
         """
+        key = ("tables", self.dataset, None)
+        return self._cached_metadata_fetch(key, _LIST_TABLES_TTL_SECONDS, self._fetch_table_list)
+
+    def iter_tables(self) -> Iterator[str]:
+        """
+        Yield table names lazily.
+
+        Serves from the list cache when fresh; otherwise streams ids
+        straight off the dataset.list pages without materializing every
+        TableListItem, so callers that stop early never pay for the rest.
+
+        Yields:
+            Table names in listing order
+        """
+        entry = _schema_cache.get(("tables", self.dataset, None))
+        if entry is not None and time.monotonic() - entry.fetched_at < _LIST_TABLES_TTL_SECONDS:
+            yield from entry.value
+            return
+
+        dataset_ref = self.client.dataset(self.dataset)
+        # page_size bounds each API response without capping the total
+        # (max_results would silently truncate datasets past the cap)
+        for table in self.client.list_tables(dataset_ref, page_size=1000):
+            yield table.table_id
+
+    def _fetch_table_list(self) -> List[str]:
+        """List dataset tables uncached."""
         try:
             dataset_ref = self.client.dataset(self.dataset)
-            tables = list(self.client.list_tables(dataset_ref))
-            return [table.table_id for table in tables]
-            
+            return [table.table_id for table in self.client.list_tables(dataset_ref)]
+
         except GoogleCloudError as e:
             logger.error("Failed to list tables", error=str(e))
             return []
@@ -301,20 +857,24 @@ class BigQueryClient:
     def get_table_metadata(self, table_names: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Get comprehensive table metadata including row counts, sizes, and creation dates.
-        
+
+        Cached process-wide like get_comprehensive_schema_info.
+
         Args:
             table_names: Optional list of specific table names
-            
+
         Returns:
             Table metadata
         """
+        key = ("metadata", self.dataset, tuple(sorted(table_names)) if table_names else None)
+        return self._cached_metadata_fetch(
+            key, _SCHEMA_CACHE_TTL_SECONDS,
+            lambda: self._fetch_table_metadata(table_names)
+        )
+
+    def _fetch_table_metadata(self, table_names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Fetch table metadata from INFORMATION_SCHEMA uncached."""
         try:
-            if table_names:
-                table_filter = "', '".join(table_names)
-                where_clause = f"WHERE table_name IN ('{table_filter}')"
-            else:
-                where_clause = ""
-            
             query = f"""
             SELECT 
                 table_name,
@@ -325,11 +885,11 @@ class BigQueryClient:
                 size_bytes,
                 description
             FROM `{settings.google_cloud_project}.{self.dataset}.INFORMATION_SCHEMA.TABLES`
-            {where_clause}
+            WHERE (ARRAY_LENGTH(@tables) = 0 OR table_name IN UNNEST(@tables))
             ORDER BY table_name
             """
-            
-            result = self.execute_query(query)
+
+            result = self.execute_query(query, params=[self._tables_param(table_names)])
             
             if not result["success"]:
                 return {"error": result.get("error")}
@@ -362,37 +922,55 @@ class BigQueryClient:
     def validate_query(self, query: str) -> Dict[str, Any]:
         """
         Validate a SQL query without executing it.
-        
+
+        Dry-run results are cached for the schema TTL, keyed by a hash of
+        the whitespace-normalized SQL, so re-validations of the same query
+        skip the round trip entirely.
+
         Args:
             query: SQL query to validate
-            
+
         Returns:
             Validation result
         """
+        normalized = " ".join(query.split()).lower()
+        key = hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+        entry = _validation_cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < _SCHEMA_CACHE_TTL_SECONDS:
+            return entry[1]
+
         try:
             # Create a dry-run query job
             job_config = bigquery.QueryJobConfig(dry_run=True)
             query_job = self.client.query(query, job_config=job_config)
-            
-            return {
+
+            result = {
                 "valid": True,
                 "total_bytes_processed": query_job.total_bytes_processed,
                 "total_bytes_billed": query_job.total_bytes_billed,
                 "estimated_cost": self._estimate_cost(query_job.total_bytes_billed)
             }
-            
+
         except GoogleCloudError as e:
-            return {
+            result = {
                 "valid": False,
                 "error": str(e)
             }
+
+        if len(_validation_cache) >= _VALIDATION_CACHE_MAX_ENTRIES:
+            # Dicts iterate in insertion order, so the first key is the oldest
+            _validation_cache.pop(next(iter(_validation_cache)))
+        _validation_cache[key] = (time.monotonic(), result)
+
+        return result
     
-    def _estimate_cost(self, bytes_billed: int) -> float:
-        """Estimate query cost based on bytes billed."""
-        # BigQuery pricing: $5 per TB scanned
-        cost_per_tb = 5.0
-        bytes_per_tb = 1024 * 1024 * 1024 * 1024
-        return (bytes_billed / bytes_per_tb) * cost_per_tb
+    def _estimate_cost(self, bytes_billed: Optional[int]) -> float:
+        """Estimate query cost based on bytes billed.
+
+        Dry-runs answered from the server-side query cache report
+        total_bytes_billed as None, which counts as free.
+        """
+        return (bytes_billed or 0) * _COST_PER_BYTE
     
     def get_table_preview(self, table_name: str, limit: int = 10) -> Dict[str, Any]:
         """
@@ -405,5 +983,17 @@ class BigQueryClient:
         Returns:
             Table preview data
         """
-        query = f"SELECT * FROM `{settings.google_cloud_project}.{self.dataset}.{table_name}` LIMIT {limit}"
-        return self.execute_query(query)
+        # Table names cannot be query parameters, so the interpolation
+        # below is only safe behind a strict identifier check
+        if not _IDENT_RE.match(table_name):
+            logger.warning("Rejected invalid table name", table_name=table_name)
+            return {
+                "success": False,
+                "error": f"Invalid table name: {table_name}",
+                "data": [],
+                "row_count": 0
+            }
+
+        query = f"SELECT * FROM `{settings.google_cloud_project}.{self.dataset}.{table_name}` LIMIT {int(limit)}"
+        # Previews never need more than a sliver of the 10GB default cap
+        return self.execute_query(query, max_bytes=50 << 20)
@@ -0,0 +1,42 @@
+"""
+Fast request-id generation with batched entropy.
+"""
+
+import os
+import threading
+
+# Each id consumes one 16-byte block; entropy is fetched from the kernel in
+# batches so the getrandom() syscall is amortized over 256 ids instead of
+# being paid on every request.
+_BLOCK_BYTES = 16
+_BATCH_BLOCKS = 256
+
+
+class _EntropyPool(threading.local):
+    """Per-thread pool of pre-fetched random bytes."""
+
+    def __init__(self):
+        self.buffer = b""
+        self.offset = 0
+
+
+_pool = _EntropyPool()
+
+
+def new_request_id() -> str:
+    """
+    Return a 32-character hex request id.
+
+    Equivalent in entropy to uuid4().hex (128 random bits) but skips UUID
+    object construction and hits os.urandom only once per 256 ids.
+
+    Returns:
+        Hex string identifier
+    """
+    pool = _pool
+    if pool.offset >= len(pool.buffer):
+        pool.buffer = os.urandom(_BATCH_BLOCKS * _BLOCK_BYTES)
+        pool.offset = 0
+    block = pool.buffer[pool.offset:pool.offset + _BLOCK_BYTES]
+    pool.offset += _BLOCK_BYTES
+    return block.hex()
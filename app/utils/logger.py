@@ -4,25 +4,41 @@ Structured logging configuration for the agentic application.
 
 import logging
 import sys
+from functools import lru_cache
 from typing import Optional
+import orjson
 import structlog
 from app.config.settings import settings
 
+_CONFIGURED = False
+
+# SQL statements attached to log events can be arbitrarily long; cap them so
+# the JSON serializer cost stays bounded on error storms.
+_MAX_FIELD_CHARS = 2048
+_TRUNCATED_FIELDS = ("query", "sql_query")
+
+
+def _truncate_large_fields(logger, method_name, event_dict):
+    """Cap known large string fields before serialization."""
+    for key in _TRUNCATED_FIELDS:
+        value = event_dict.get(key)
+        if isinstance(value, str) and len(value) > _MAX_FIELD_CHARS:
+            event_dict[key] = value[:_MAX_FIELD_CHARS] + "...[truncated]"
+    return event_dict
+
+
+def _orjson_serializer(obj, **kwargs) -> str:
+    """orjson-backed JSON rendering (3-5x stdlib json), decoded for stdlib handlers."""
+    return orjson.dumps(obj, default=str).decode()
+
+
+def _configure_once() -> None:
+    """Configure structlog and stdlib logging exactly once per process."""
+    global _CONFIGURED
+    if _CONFIGURED:
+        return
+    _CONFIGURED = True
 
-def get_logger(name: Optional[str] = None) -> structlog.BoundLogger:
-    """
-    Get a structured logger instance.
-    
-    Args:
-        name: Logger name (defaults to 'agentic_app')
-        
-    Returns:
-        Configured structured logger
-    """
-    if name is None:
-        name = "agentic_app"
-    
-    # Configure structlog
     structlog.configure(
         processors=[
             structlog.stdlib.filter_by_level,
@@ -33,22 +49,44 @@ def get_logger(name: Optional[str] = None) -> structlog.BoundLogger:
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
             structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer()
+            _truncate_large_fields,
+            structlog.processors.JSONRenderer(serializer=_orjson_serializer)
         ],
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
-        wrapper_class=structlog.stdlib.BoundLogger,
+        # Filtering bound logger returns immediately for suppressed levels,
+        # before any processor or event-dict work runs
+        wrapper_class=structlog.make_filtering_bound_logger(
+            getattr(logging, settings.log_level.upper())
+        ),
         cache_logger_on_first_use=True,
     )
-    
+
     # Configure standard library logging
     logging.basicConfig(
         format="%(message)s",
         stream=sys.stdout,
         level=getattr(logging, settings.log_level.upper()),
     )
-    
-    return structlog.get_logger(name)
+
+
+@lru_cache(maxsize=128)
+def get_logger(name: Optional[str] = None) -> structlog.BoundLogger:
+    """
+    Get a structured logger instance.
+
+    Configuration runs once per process; repeated calls for the same name
+    return the identical cached logger instead of rebuilding global logging
+    state on every invocation.
+
+    Args:
+        name: Logger name (defaults to 'agentic_app')
+
+    Returns:
+        Configured structured logger
+    """
+    _configure_once()
+    return structlog.get_logger(name or "agentic_app")
 
 
 # Global logger instance
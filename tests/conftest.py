@@ -0,0 +1,99 @@
+"""
+Shared fixtures for the test suite.
+"""
+
+import asyncio
+import os
+
+import pytest
+
+try:
+    import uvloop
+except ImportError:  # optional: stdlib loop is used when absent
+    uvloop = None
+
+try:
+    from blockbuster import blockbuster_ctx
+except ImportError:  # optional: blocking-call detection is skipped when absent
+    blockbuster_ctx = None
+
+from tests.fakes import FakeBigQueryClient
+
+# Queries the suite analyzes repeatedly; warming them once at session
+# start means later tests hit the async LRU cache on their first call
+CANONICAL_QUERIES = (
+    "What is the total revenue for Q1 2024?",
+    "Show the total revenue by quarter for 2024",
+)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--no-warm",
+        action="store_true",
+        default=False,
+        help="Skip pre-warming the agent analysis caches at session start",
+    )
+
+
+def pytest_sessionstart(session):
+    """Pre-warm the analysis caches on the canonical fixture queries.
+
+    Best-effort: when no LLM is reachable the failures are swallowed
+    and, since the cache never stores errors, the suite simply runs
+    without warm caches. Environments with no endpoint configured skip
+    the attempt entirely rather than paying connection timeouts before
+    the first test.
+    """
+    if session.config.getoption("--no-warm"):
+        return
+    if not (os.environ.get("AZURE_OPENAI_API_KEY") and os.environ.get("AZURE_OPENAI_ENDPOINT")):
+        return
+
+    async def warm():
+        from app.agents.query_agent import QueryAgent
+
+        # The fake keeps warm-up off Google credentials; _analyze_query
+        # never touches BigQuery anyway
+        agent = QueryAgent("warm", "warm", bq_client=FakeBigQueryClient())
+        await asyncio.gather(
+            *(agent._analyze_query(query, {}) for query in CANONICAL_QUERIES),
+            return_exceptions=True
+        )
+
+    try:
+        asyncio.run(asyncio.wait_for(warm(), timeout=10))
+    except Exception:
+        pass
+
+
+def pytest_asyncio_loop_factories(config, item):
+    """Run the shared session loop on uvloop when it is installed.
+
+    This is pytest-asyncio's supported replacement for overriding the
+    deprecated event_loop_policy fixture.
+    """
+    if uvloop is not None:
+        return {"uvloop": uvloop.new_event_loop}
+    return {"asyncio": asyncio.new_event_loop}
+
+
+@pytest.fixture(autouse=True)
+def no_blocking_calls():
+    """Fail any test that makes a blocking call inside async code.
+
+    Catches regressions like open()/time.sleep()/requests in awaited
+    agent methods, which would otherwise stall the event loop silently
+    in production. No-op when blockbuster is not installed.
+    """
+    if blockbuster_ctx is None:
+        yield
+        return
+    with blockbuster_ctx():
+        yield
+
+
+@pytest.fixture(scope="session")
+def bq_client():
+    """One FakeBigQueryClient per test session (one per xdist worker)."""
+    return FakeBigQueryClient()
@@ -0,0 +1,153 @@
+"""
+Lightweight in-memory fakes for external clients used in tests.
+"""
+
+import json
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+_DEFAULT_QUERY_RESPONSE = {
+    "success": True,
+    "data": [{"total_revenue": 1500000.00}],
+    "row_count": 1,
+    "execution_time_ms": 1000
+}
+
+_DEFAULT_VALIDATION_RESPONSE = {
+    "valid": True,
+    "total_bytes_processed": 1000000,
+    "total_bytes_billed": 1000000,
+    "estimated_cost": 0.000005
+}
+
+
+class FakeBigQueryClient:
+    """
+    Deterministic stand-in for BigQueryClient.
+
+    Canned responses are keyed by SQL text with a default for anything
+    unseen, so behavior never depends on call order. Plain attributes and
+    a simple call log avoid unittest.mock's per-call bookkeeping and make
+    the fake safe to build once per xdist worker. __slots__ keeps the
+    instance small and attribute access on the hot fake methods direct.
+    """
+
+    __slots__ = ("responses", "calls")
+
+    def __init__(self, responses: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.responses = dict(responses or {})
+        self.calls: List[tuple] = []
+
+    def execute_query(self, query: str, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        """Return the canned result for query (sync, like the real client)."""
+        self.calls.append(("execute_query", query))
+        return self.responses.get(query, _DEFAULT_QUERY_RESPONSE)
+
+    def validate_query(self, query: str) -> Dict[str, Any]:
+        """Return a passing validation payload."""
+        self.calls.append(("validate_query", query))
+        return _DEFAULT_VALIDATION_RESPONSE
+
+    async def validate_query_batched(self, query: str) -> Dict[str, Any]:
+        """Async variant used directly by the agents."""
+        self.calls.append(("validate_query_batched", query))
+        return _DEFAULT_VALIDATION_RESPONSE
+
+    def get_comprehensive_schema_info(self, table_names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Return a minimal one-table schema."""
+        self.calls.append(("get_comprehensive_schema_info", tuple(table_names or ())))
+        return {
+            "project": "test_project",
+            "dataset": "test_dataset",
+            "tables": {},
+            "total_tables": 0,
+            "total_columns": 0
+        }
+
+    def list_tables(self) -> List[str]:
+        """Return a static table list."""
+        self.calls.append(("list_tables",))
+        return ["sales"]
+
+
+_DEFAULT_ANALYSIS = {
+    "intent": "data_retrieval",
+    "entities": ["sales"],
+    "tables": ["revenue"],
+    "metrics": ["revenue"],
+    "time_period": "Q1 2024",
+    "aggregation": "sum",
+    "filters": [],
+    "complexity": "simple",
+    "estimated_cost": "low",
+    "business_domain": "financial"
+}
+
+# One JSON object covering the fields every raw chat call site parses
+# (intent analysis, impact scoring and confidence assessment);
+# list-producing sites split on newlines, so a single-line payload
+# yields a one-element list
+_DEFAULT_CHAT_CONTENT = json.dumps({
+    "business_objective": "data_retrieval",
+    "business_domain": "financial",
+    "business_metrics": ["revenue"],
+    "financial_impact": {"score": 7, "reasoning": "direct revenue question"},
+    "operational_impact": {"score": 5, "reasoning": "recurring report"},
+    "strategic_impact": {"score": 6, "reasoning": "feeds planning"},
+    "risk_impact": {"score": 3, "reasoning": "read-only query"},
+    "overall_impact": "medium",
+    "data_quality_score": 8,
+    "sample_adequacy_score": 7,
+    "methodology_score": 8,
+    "overall_confidence": "high",
+    "limitations": [],
+    "recommendations_for_improvement": []
+})
+
+
+class FakeAzureOpenAIClient:
+    """
+    Deterministic stand-in for the Azure OpenAI client wrapper.
+
+    Covers both ways the agents talk to the LLM: the wrapper's high-level
+    methods (analyze_query_intent, generate_sql_query, ...) and the raw
+    client.chat.completions.create chain the impact agent drives
+    directly. Every response is canned, so tests that exercise the full
+    workflow never depend on a live endpoint.
+    """
+
+    __slots__ = ("deployment_name", "calls", "client")
+
+    def __init__(self):
+        self.deployment_name = "fake-deployment"
+        self.calls: List[tuple] = []
+        self.client = SimpleNamespace(
+            chat=SimpleNamespace(completions=SimpleNamespace(create=self._chat_create))
+        )
+
+    async def _chat_create(self, **kwargs: Any) -> Any:
+        """Return a canned chat completion (mimics the SDK response shape)."""
+        self.calls.append(("chat.completions.create", kwargs.get("model")))
+        message = SimpleNamespace(content=_DEFAULT_CHAT_CONTENT)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    async def analyze_query_intent(self, query: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Return the canned query analysis."""
+        self.calls.append(("analyze_query_intent", query))
+        return dict(_DEFAULT_ANALYSIS)
+
+    async def generate_sql_query(self, query: str, schema_info: Dict[str, Any],
+                                 analysis: Dict[str, Any]) -> str:
+        """Return a fixed, valid-looking SQL statement."""
+        self.calls.append(("generate_sql_query", query))
+        return "SELECT SUM(revenue) AS total_revenue FROM sales"
+
+    async def generate_summary(self, query_result: Dict[str, Any], original_query: str) -> str:
+        """Return a fixed summary sentence."""
+        self.calls.append(("generate_summary", original_query))
+        return "The total revenue is $1,500,000."
+
+    async def generate_insights(self, query_result: Dict[str, Any], original_query: str) -> List[str]:
+        """Return a fixed single insight."""
+        self.calls.append(("generate_insights", original_query))
+        return ["Revenue is concentrated in a single quarter."]
@@ -0,0 +1,30 @@
+"""
+Microbenchmarks pinning coordinator response-assembly performance.
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from app.agents.coordinator_agent import CoordinatorAgent
+
+
+def test_bench_generate_comprehensive_response(benchmark):
+    """Benchmark response assembly against a large recommendation list.
+
+    Pins the list-plus-join implementation: an accidental return to
+    quadratic string concatenation shows up as a mean-time regression
+    under --benchmark-compare-fail.
+    """
+    coordinator = CoordinatorAgent("bench_session", "bench_request")
+    payload = {
+        "user_response": "The total revenue is $1,500,000.",
+        "optimization_summary": {"cost_savings_percent": 15.5},
+        "impact_summary": {"overall_impact_score": 0.75},
+        "recommendations": [{"description": f"rec {i}"} for i in range(1000)]
+    }
+
+    result = benchmark(coordinator._generate_comprehensive_response, payload)
+
+    assert "15.5%" in result
+    assert "rec 0" in result
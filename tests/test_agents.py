@@ -4,131 +4,224 @@ Tests for agent implementations.
 
 import pytest
 import asyncio
-from unittest.mock import Mock, patch
+import inspect
+from unittest.mock import AsyncMock, Mock
 
+from app.agents import _cache
 from app.agents.query_agent import QueryAgent
 from app.agents.optimization_agent import OptimizationAgent
 from app.agents.impact_analysis_agent import ImpactAnalysisAgent
 from app.agents.coordinator_agent import CoordinatorAgent
+from app.config.settings import settings
 from app.models.agent import AgentType, AgentState
+from tests.fakes import FakeAzureOpenAIClient, FakeBigQueryClient
 
 
-class TestQueryAgent:
+def _make_agent(agent_cls):
+    """Build an agent for tests, wired to a fake BigQuery client.
+
+    Constructing the real client requires Google credentials, so every
+    agent that accepts one gets a FakeBigQueryClient; the coordinator
+    threads it through to its sub-agents.
+    """
+    if "bq_client" in inspect.signature(agent_cls.__init__).parameters:
+        return agent_cls("test_session", "test_request", bq_client=FakeBigQueryClient())
+    return agent_cls("test_session", "test_request")
+
+
+@pytest.mark.parametrize("agent_cls", [
+    QueryAgent,
+    OptimizationAgent,
+    ImpactAnalysisAgent,
+    CoordinatorAgent
+])
+def test_agent_construction(agent_cls):
+    """Test construction invariants shared by every agent type."""
+    agent = _make_agent(agent_cls)
+
+    assert agent.session_id == "test_session"
+    assert agent.request_id == "test_request"
+    assert agent.agent_id is not None
+    assert agent.state == AgentState.IDLE
+    assert agent.steps == []
+
+
+@pytest.fixture(scope="class")
+def agent(request):
+    """One shared agent per test class (see _AgentTestBase).
+
+    Defined at module level rather than as a method: a class-scoped
+    fixture bound to a test-class instance is deprecated in pytest and
+    request.cls gives us the subclass's agent_cls anyway.
+    """
+    return _make_agent(request.cls.agent_cls)
+
+
+class _AgentTestBase:
+    """Shared fixture plumbing for the per-agent test classes.
+
+    Subclasses set agent_cls; the module-level class-scoped agent fixture
+    builds one shared instance per class and the autouse reset clears
+    per-execution state between tests. (A cached_property would not work
+    here: pytest instantiates the test class per test, which would
+    silently rebuild the agent every time.)
+    """
+
+    agent_cls = None
+
+    @pytest.fixture(autouse=True)
+    def _fresh_agent(self, agent):
+        """Reset per-execution state so tests never see each other's runs."""
+        agent.reset()
+
+
+class TestQueryAgent(_AgentTestBase):
     """Test cases for QueryAgent."""
-    
-    @pytest.fixture
-    def query_agent(self):
-        """Create a QueryAgent instance for testing."""
-        return QueryAgent("test_session", "test_request")
-    
-    @pytest.mark.asyncio
-    async def test_analyze_query(self, query_agent):
-        """Test query analysis functionality."""
-        query = "What is the total revenue for Q1 2024?"
+
+    agent_cls = QueryAgent
+
+    @pytest.mark.parametrize("query", [
+        "What is the total revenue for Q1 2024?",
+        "Show the total revenue by quarter for 2024",
+    ])
+    async def test_analyze_query(self, agent, monkeypatch, clear_analysis_caches, query):
+        """Test query analysis functionality across phrasing variants."""
+        monkeypatch.setattr(agent, "llm_client", FakeAzureOpenAIClient())
         context = {}
-        
-        analysis = await query_agent._analyze_query(query, context)
-        
+
+        analysis = await agent._analyze_query(query, context)
+
         assert analysis["intent"] == "data_retrieval"
         assert "revenue" in analysis["tables"]
         assert analysis["business_domain"] == "financial"
-    
-    @pytest.mark.asyncio
-    async def test_generate_sql(self, query_agent):
+
+    async def test_generate_sql(self, agent, monkeypatch, tmp_path):
         """Test SQL generation functionality."""
+        from app.agents import query_agent as qa_module
+        from app.agents.cache import AgentCache
+
+        monkeypatch.setattr(agent, "llm_client", FakeAzureOpenAIClient())
+        monkeypatch.setattr(qa_module, "get_agent_cache",
+                            lambda cache=AgentCache(str(tmp_path / "sql_cache.db")): cache)
         query = "What is the total revenue?"
         analysis = {"tables": ["sales"], "complexity": "simple"}
         schema_info = {}
         context = {}
-        
-        sql = await query_agent._generate_sql(query, analysis, schema_info, context)
-        
+
+        sql = await agent._generate_sql(query, analysis, schema_info, context)
+
         assert "SELECT" in sql.upper()
         assert "FROM" in sql.upper()
 
+    async def test_generate_sql_uses_cache(self, agent, monkeypatch, tmp_path):
+        """Test that repeated SQL generation is served from the disk cache."""
+        from app.agents import query_agent as qa_module
+        from app.agents.cache import AgentCache
+
+        monkeypatch.setattr(qa_module, "get_agent_cache",
+                            lambda cache=AgentCache(str(tmp_path / "sql_cache.db")): cache)
+        llm = Mock()
+        llm.generate_sql_query = AsyncMock(return_value="SELECT 1")
+        monkeypatch.setattr(agent, "llm_client", llm)
+
+        analysis = {"tables": ["sales"], "complexity": "simple"}
+        sql_first = await agent._generate_sql("What is the total revenue?", analysis, {}, {})
+        sql_second = await agent._generate_sql("What is the total revenue?", analysis, {}, {})
+
+        assert sql_first == sql_second == "SELECT 1"
+        llm.generate_sql_query.assert_awaited_once()
+
 
-class TestOptimizationAgent:
+class TestOptimizationAgent(_AgentTestBase):
     """Test cases for OptimizationAgent."""
-    
-    @pytest.fixture
-    def optimization_agent(self):
-        """Create an OptimizationAgent instance for testing."""
-        return OptimizationAgent("test_session", "test_request")
-    
-    @pytest.mark.asyncio
-    async def test_analyze_query_structure(self, optimization_agent):
+
+    agent_cls = OptimizationAgent
+
+    async def test_analyze_query_structure(self, agent):
         """Test query structure analysis."""
         sql_query = "SELECT * FROM sales WHERE year = 2024"
         
-        analysis = await optimization_agent._analyze_query_structure(sql_query)
+        analysis = await agent._analyze_query_structure(sql_query)
         
         assert analysis["query_type"] == "SELECT"
         assert analysis["complexity_score"] >= 0
         assert not analysis["group_by"]
     
-    @pytest.mark.asyncio
-    async def test_identify_optimizations(self, optimization_agent):
+    async def test_identify_optimizations(self, agent):
         """Test optimization identification."""
         sql_query = "SELECT * FROM sales"
-        query_analysis = {"query_type": "SELECT", "limit": None}
-        
-        opportunities = await optimization_agent._identify_optimizations(sql_query, query_analysis)
+        # _identify_optimizations consumes the full structure analysis,
+        # exactly as the execute() pipeline feeds it
+        query_analysis = await agent._analyze_query_structure(sql_query)
+
+        opportunities = await agent._identify_optimizations(sql_query, query_analysis)
         
         assert len(opportunities) > 0
         assert any(opp["type"] == "select_columns" for opp in opportunities)
 
 
-class TestImpactAnalysisAgent:
+class TestImpactAnalysisAgent(_AgentTestBase):
     """Test cases for ImpactAnalysisAgent."""
-    
-    @pytest.fixture
-    def impact_agent(self):
-        """Create an ImpactAnalysisAgent instance for testing."""
-        return ImpactAnalysisAgent("test_session", "test_request")
-    
-    @pytest.mark.asyncio
-    async def test_analyze_query_intent(self, impact_agent):
-        """Test query intent analysis."""
+
+    agent_cls = ImpactAnalysisAgent
+
+    async def test_intent_and_metrics(self, agent, monkeypatch, clear_analysis_caches):
+        """Test intent analysis and metrics extraction.
+
+        The two awaits are independent, so they run under one gather and
+        the test only waits for the slower of the two.
+        """
+        monkeypatch.setattr(agent, "llm_client", FakeAzureOpenAIClient())
         original_query = "What is the total revenue for this quarter?"
         sql_query = "SELECT SUM(revenue) FROM sales WHERE quarter = 'Q1'"
-        context = {}
-        
-        intent = await impact_agent._analyze_query_intent(original_query, sql_query, context)
-        
-        assert intent["business_domain"] == "financial"
-        assert "revenue" in intent["business_metrics"]
-    
-    @pytest.mark.asyncio
-    async def test_extract_key_metrics(self, impact_agent):
-        """Test key metrics extraction."""
         query_results = {
             "data": [{"total_revenue": 1500000.00}]
         }
         intent_analysis = {"business_metrics": ["revenue"]}
         
-        metrics = await impact_agent._extract_key_metrics(query_results, intent_analysis)
+        intent, metrics = await asyncio.gather(
+            agent._analyze_query_intent(original_query, sql_query, {}),
+            agent._extract_key_metrics(query_results, intent_analysis)
+        )
         
+        assert intent["business_domain"] == "financial"
+        assert "revenue" in intent["business_metrics"]
         assert metrics["primary_metric"] is not None
         assert metrics["primary_metric"]["name"] == "total_revenue"
 
+    async def test_analyze_query_intent_reuses_shared_analysis(self, agent, monkeypatch,
+                                                               clear_analysis_caches):
+        """Test that a workflow-shared analysis skips LLM re-parsing."""
+        llm = Mock()
+        monkeypatch.setattr(agent, "llm_client", llm)
+        context = {"_analysis": {
+            "intent": "data_retrieval",
+            "business_domain": "financial",
+            "metrics": ["revenue"]
+        }}
+        
+        intent = await agent._analyze_query_intent(
+            "What is the total revenue?", "SELECT SUM(revenue) FROM sales", context
+        )
+        
+        assert intent["business_domain"] == "financial"
+        assert "revenue" in intent["business_metrics"]
+        assert not llm.mock_calls
+
 
-class TestCoordinatorAgent:
+class TestCoordinatorAgent(_AgentTestBase):
     """Test cases for CoordinatorAgent."""
-    
-    @pytest.fixture
-    def coordinator_agent(self):
-        """Create a CoordinatorAgent instance for testing."""
-        return CoordinatorAgent("test_session", "test_request")
-    
-    @pytest.mark.asyncio
-    async def test_initialize_workflow(self, coordinator_agent):
+
+    agent_cls = CoordinatorAgent
+
+    async def test_initialize_workflow(self, agent):
         """Test workflow initialization."""
         user_query = "What is the total revenue?"
         context = {}
         enable_optimization = True
         enable_impact_analysis = True
         
-        workflow = await coordinator_agent._initialize_workflow(
+        workflow = await agent._initialize_workflow(
             user_query, context, enable_optimization, enable_impact_analysis
         )
         
@@ -137,8 +230,56 @@ class TestCoordinatorAgent:
         assert workflow["agents_enabled"]["optimization_agent"] is True
         assert workflow["agents_enabled"]["impact_analysis_agent"] is True
     
-    @pytest.mark.asyncio
-    async def test_generate_comprehensive_response(self, coordinator_agent):
+    async def test_coordinator_bounded_concurrency(self, agent):
+        """Test that sub-agent dispatch respects the concurrency cap."""
+        running = 0
+        peak = 0
+
+        class _CountingAgent:
+            async def run_with_timeout(self, input_data):
+                nonlocal running, peak
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.001)
+                running -= 1
+                return input_data
+
+        await asyncio.gather(*(
+            agent._run_sub_agent(_CountingAgent(), {"workflow": i})
+            for i in range(100)
+        ))
+
+        assert peak <= settings.max_parallel_agents
+
+    @pytest.mark.parametrize("n", [1, 8, 32])
+    async def test_run_batch_async(self, agent, monkeypatch, tmp_path, n):
+        """Test that batch execution keeps per-workflow state isolated.
+
+        Drives the real execute() path (externals faked) so the steps,
+        result and error each workflow accumulates would expose any state
+        shared across concurrent runs.
+        """
+        from app.agents.cache import AgentCache
+
+        llm = FakeAzureOpenAIClient()
+        monkeypatch.setattr("app.agents.query_agent.get_azure_client", lambda: llm)
+        monkeypatch.setattr("app.agents.impact_analysis_agent.get_azure_client", lambda: llm)
+        monkeypatch.setattr("app.agents.query_agent.get_agent_cache",
+                            lambda cache=AgentCache(str(tmp_path / "sql_cache.db")): cache)
+
+        inputs = [{"query": f"What is metric {i}?", "context": {},
+                   "enable_optimization": False, "enable_impact_analysis": False}
+                  for i in range(n)]
+
+        responses = await agent.run_batch_async(inputs)
+
+        assert len(responses) == n
+        assert len({response.agent_id for response in responses}) == n
+        for i, response in enumerate(responses):
+            assert response.error is None
+            assert response.result["query_result"]["original_query"] == f"What is metric {i}?"
+
+    async def test_generate_comprehensive_response(self, agent):
         """Test comprehensive response generation."""
         synthesized_result = {
             "user_response": "The total revenue is $1,500,000.",
@@ -150,7 +291,7 @@ class TestCoordinatorAgent:
             ]
         }
         
-        response = coordinator_agent._generate_comprehensive_response(synthesized_result)
+        response = agent._generate_comprehensive_response(synthesized_result)
         
         assert "total revenue" in response.lower()
         assert "15.5%" in response
@@ -158,36 +299,47 @@ class TestCoordinatorAgent:
         assert "monitor revenue trends" in response.lower()
 
 
-@pytest.mark.asyncio
-async def test_agent_execution_flow():
-    """Test the complete agent execution flow."""
-    # This is a high-level integration test
-    coordinator = CoordinatorAgent("test_session", "test_request")
-    
+@pytest.fixture
+def clear_analysis_caches():
+    """Opt-in fixture for tests that assert on cache behavior.
+
+    Analysis results are memoized process-wide; request this fixture to
+    start from (and leave behind) empty caches.
+    """
+    _cache.clear_analysis_caches()
+    yield
+    _cache.clear_analysis_caches()
+
+
+async def test_agent_execution_flow(bq_client, monkeypatch, tmp_path):
+    """Test the complete agent execution flow.
+
+    High-level integration test with both externals faked: the fake
+    BigQuery client is injected through the coordinator and the fake LLM
+    replaces get_azure_client in the modules that use it, so the workflow
+    runs deterministically with no network and must complete cleanly.
+    """
+    from app.agents.cache import AgentCache
+
+    llm = FakeAzureOpenAIClient()
+    monkeypatch.setattr("app.agents.query_agent.get_azure_client", lambda: llm)
+    monkeypatch.setattr("app.agents.impact_analysis_agent.get_azure_client", lambda: llm)
+    monkeypatch.setattr("app.agents.query_agent.get_agent_cache",
+                        lambda cache=AgentCache(str(tmp_path / "sql_cache.db")): cache)
+
+    coordinator = CoordinatorAgent("test_session", "test_request", bq_client=bq_client)
+
     input_data = {
         "query": "What is the total revenue?",
         "context": {},
         "enable_optimization": True,
         "enable_impact_analysis": True
     }
-    
-    # Mock the agent dependencies to avoid actual BigQuery calls
-    with patch('app.agents.query_agent.BigQueryClient') as mock_bq:
-        mock_bq.return_value.execute_query.return_value = {
-            "success": True,
-            "data": [{"total_revenue": 1500000.00}],
-            "row_count": 1,
-            "execution_time_ms": 1000
-        }
-        mock_bq.return_value.validate_query.return_value = {
-            "valid": True,
-            "total_bytes_processed": 1000000,
-            "total_bytes_billed": 1000000
-        }
-        
-        response = await coordinator.execute(input_data)
-        
-        assert response.agent_id is not None
-        assert response.state in [AgentState.COMPLETED, AgentState.ERROR]
-        assert response.result is not None
+
+    response = await coordinator.run_with_timeout(input_data)
+
+    assert response.agent_id is not None
+    assert response.state == AgentState.COMPLETED
+    assert response.result is not None
+    assert response.result["synthesized_result"]["user_response"]
 